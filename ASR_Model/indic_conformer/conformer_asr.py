@@ -5,6 +5,16 @@ from transformers import AutoModel
 import onnxruntime as ort
 import os
 
+# Resample kernels keyed by (orig_freq, new_freq); building one is not free
+_RESAMPLERS = {}
+
+
+def _get_resampler(orig_freq, new_freq):
+    key = (orig_freq, new_freq)
+    if key not in _RESAMPLERS:
+        _RESAMPLERS[key] = torchaudio.transforms.Resample(orig_freq=orig_freq, new_freq=new_freq)
+    return _RESAMPLERS[key]
+
 
 class IndicConformerASR:
     def __init__(self, model_name="ai4bharat/indic-conformer-600m-multilingual"):
@@ -46,13 +56,26 @@ class IndicConformerASR:
         self.sample_rate = 16000
 
     def load_audio(self, audio_path):
+        # Already decoded 16 kHz mono samples (ndarray / tensor) are used as-is
+        if hasattr(audio_path, "shape"):
+            return torch.as_tensor(audio_path, dtype=torch.float32).reshape(1, -1)
+        # Single SoX pass for downmix + resample when the backend is available
+        try:
+            wav, _ = torchaudio.sox_effects.apply_effects_file(
+                audio_path, [["channels", "1"], ["rate", str(self.sample_rate)]]
+            )
+            return wav
+        except Exception:
+            pass
         wav, sr = torchaudio.load(audio_path)
         wav = torch.mean(wav, dim=0, keepdim=True)  # Convert to mono
         if sr != self.sample_rate:
-            wav = torchaudio.transforms.Resample(orig_freq=sr, new_freq=self.sample_rate)(wav)
+            wav = _get_resampler(sr, self.sample_rate)(wav)
         return wav
 
     def transcribe(self, audio_path, language_code="hi", decoder_type="ctc"):
         wav = self.load_audio(audio_path)
-        result = self.model(wav, language_code, decoder_type)
+        # inference_mode: no autograd graph or version-counter bookkeeping on the torch side
+        with torch.inference_mode():
+            result = self.model(wav, language_code, decoder_type)
         return result
@@ -7,11 +7,19 @@ import yt_dlp
 import sounddevice as sd
 import numpy as np
 import os
+import io
+import contextlib
+import threading
 from scipy.io.wavfile import write
 from langid import classify
 import torchaudio
 from .spoof_detection import is_spoofed_audio
 
+try:
+    import av  # PyAV: in-process libavcodec decode (pip install av)
+except Exception:
+    av = None
+
 # ✅ Updated to include all IndicConformer-supported languages
 TARGET_LANGS = {
     'en': 'English', 'as': 'Assamese', 'bn': 'Bengali', 'brx': 'Bodo',
@@ -23,48 +31,224 @@ TARGET_LANGS = {
     'ar': 'Arabic', 'ru': 'Russian', 'it': 'Italian', 'ko': 'Korean', 'ja': 'Japanese',
     'es': 'Spanish'
 }
+TARGET_LANGS_SET = frozenset(TARGET_LANGS)
+
+def load_audio_array(audio, sample_rate=16000):
+    """Path or encoded bytes -> 16 kHz mono float32 in memory (PyAV or an ffmpeg pipe, no temp file); ndarrays pass through."""
+    if isinstance(audio, np.ndarray):
+        return audio.astype(np.float32, copy=False).reshape(-1)
+    return _decode_to_np(audio, sample_rate)
+
+def vad_trim(audio, min_silence_ms=500):
+    """Keep only voiced samples of 16 kHz audio (Silero VAD shipped with faster-whisper); unchanged if VAD is unavailable or finds nothing."""
+    try:
+        from faster_whisper.vad import get_speech_timestamps, VadOptions
+    except Exception:
+        return audio
+    speech = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=min_silence_ms))
+    if not speech:
+        return audio
+    return np.concatenate([audio[ts['start']:ts['end']] for ts in speech])
+
+# Whisper models keyed by (size, device), shared by LID, dialect detection and ASR
+_WHISPER_CACHE = {}
+
+def get_whisper(model_size="small", device=None):
+    device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+    key = (model_size, device)
+    if key not in _WHISPER_CACHE:
+        print(f"📦 Loading Whisper model '{model_size}' on {device}")
+        _WHISPER_CACHE[key] = whisper.load_model(model_size, device=device)
+    return _WHISPER_CACHE[key]
+
+# Opt-in BF16 autocast for CPU LID; only pays off on hosts with AVX-512 BF16 / AMX
+LID_CPU_BF16 = os.getenv("VASHA_LID_CPU_BF16", "0") == "1"
+
+def whisper_autocast(device):
+    """FP16 autocast on CUDA, optional BF16 on CPU, no-op otherwise."""
+    if str(device).startswith("cuda"):
+        return torch.autocast(device_type="cuda", dtype=torch.float16)
+    if LID_CPU_BF16:
+        return torch.autocast(device_type="cpu", dtype=torch.bfloat16)
+    return contextlib.nullcontext()
+
+# Per-thread pinned staging buffer: LID input is always padded to 30 s, so it is allocated once
+_pin_local = threading.local()
+
+def _to_device_pinned(audio, device):
+    """Copy a float32 array to `device` through a reused pinned buffer with non_blocking=True."""
+    n = audio.shape[-1]
+    buf = getattr(_pin_local, "buf", None)
+    if buf is None or buf.numel() < n:
+        buf = _pin_local.buf = torch.empty(n, dtype=torch.float32).pin_memory()
+    done = getattr(_pin_local, "done", None)
+    if done is not None:
+        done.synchronize()  # the previous async copy out of buf has finished
+    host = buf[:n]
+    host.numpy()[:] = audio
+    out = host.to(device, non_blocking=True)
+    done = _pin_local.done = torch.cuda.Event()
+    done.record()
+    return out
+
+def _mel(model, audio):
+    """30 s log-mel on the model's device, in FP16 on CUDA."""
+    if model.device.type == "cuda":
+        # STFT runs on the GPU, fed by an async H2D copy
+        audio = _to_device_pinned(np.asarray(audio, dtype=np.float32), model.device)
+        return whisper.log_mel_spectrogram(audio, n_mels=model.dims.n_mels).half()
+    return whisper.log_mel_spectrogram(audio, n_mels=model.dims.n_mels).to(model.device)
+
+# LID backend: "faster" (CTranslate2, the default when faster-whisper is installed), "whisper",
+# or "ecapa" (SpeechBrain VoxLingua107, ~20 MB; falls back to "faster" if speechbrain is missing)
+LID_BACKEND = os.getenv("VASHA_LID_BACKEND", "faster").strip().lower()
+
+ECAPA_LID_SOURCE = "speechbrain/lang-id-voxlingua107-ecapa"
+_ECAPA_CACHE = {}
+
+# Downstream ASR (faster-whisper / whisper) only accepts Whisper's language codes
+WHISPER_LANG_CODES = frozenset(whisper.tokenizer.LANGUAGES)
+# VoxLingua107 labels whose code differs from Whisper's; labels with no Whisper
+# equivalent (ceb, war, sco, gv, ia, gn, eo, ab, ...) are skipped at detection time
+VOXLINGUA_TO_WHISPER = {"iw": "he"}
+
+def get_ecapa_lid(device=None):
+    """VoxLingua107 ECAPA language classifier keyed by device; None if speechbrain is missing."""
+    try:
+        from speechbrain.inference.classifiers import EncoderClassifier  # speechbrain >= 1.0
+    except Exception:
+        try:
+            from speechbrain.pretrained import EncoderClassifier
+        except Exception:
+            return None
+    device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+    if device not in _ECAPA_CACHE:
+        print(f"📦 Loading ECAPA LID model '{ECAPA_LID_SOURCE}' on {device}")
+        _ECAPA_CACHE[device] = EncoderClassifier.from_hparams(
+            source=ECAPA_LID_SOURCE,
+            savedir=os.path.join("pretrained_models", "lang-id-voxlingua107-ecapa"),
+            run_opts={"device": device},
+        )
+    return _ECAPA_CACHE[device]
+
+_FW_LID_CACHE = {}
+
+def get_faster_whisper_lid(model_size="small", device=None):
+    """faster-whisper model for LID keyed by (size, device); None if faster-whisper is missing."""
+    try:
+        from faster_whisper import WhisperModel
+    except Exception:
+        return None
+    device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+    key = (model_size, device)
+    if key not in _FW_LID_CACHE:
+        compute_type = "float16" if device == "cuda" else "int8"
+        print(f"📦 Loading faster-whisper LID model '{model_size}' on {device} [{compute_type}]")
+        _FW_LID_CACHE[key] = WhisperModel(model_size, device=device, compute_type=compute_type)
+    return _FW_LID_CACHE[key]
 
 class LanguageIdentifier:
-    def __init__(self, model_size="small", device=None):
-        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
-        print(f"📦 Loading Whisper model '{model_size}' on {self.device}")
-        self.model = whisper.load_model(model_size, device=self.device)
+    def __init__(self, model_size="small", device=None, shared_model=None, backend=None):
+        """Pass `shared_model` to run LID on an already loaded (e.g. ASR) Whisper model; `backend` overrides VASHA_LID_BACKEND."""
+        self.fw_model = None
+        self.ecapa = None
+        self.model = None
+        backend = (backend or LID_BACKEND).lower()
+        if shared_model is not None:
+            self.model = shared_model
+            self.device = str(shared_model.device)
+        else:
+            self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+            if backend == "ecapa":
+                self.ecapa = get_ecapa_lid(self.device)
+            if self.ecapa is None and backend in ("faster", "ecapa"):
+                self.fw_model = get_faster_whisper_lid(model_size, self.device)
+            if self.ecapa is None and self.fw_model is None:
+                self.model = get_whisper(model_size, self.device)
+
+    def _ecapa_codes(self):
+        """Whisper code (or None) for every classifier index; labels look like "hi: Hindi"."""
+        codes = getattr(self, "_ecapa_code_list", None)
+        if codes is None:
+            enc = self.ecapa.hparams.label_encoder
+            codes = []
+            for i in range(len(enc)):
+                code = enc.ind2lab[i].split(":")[0].strip()
+                code = VOXLINGUA_TO_WHISPER.get(code, code)
+                codes.append(code if code in WHISPER_LANG_CODES else None)
+            self._ecapa_code_list = codes
+        return codes
+
+    def _detect_ecapa(self, audio):
+        with torch.inference_mode():
+            log_probs, _, _, _ = self.ecapa.classify_batch(torch.from_numpy(np.ascontiguousarray(audio)).unsqueeze(0))
+        log_probs = log_probs[0]
+        codes = self._ecapa_codes()
+        # best label that Whisper can transcribe
+        for i in torch.argsort(log_probs, descending=True).tolist():
+            if codes[i] is not None:
+                return codes[i], float(log_probs[i].exp())
+        return None, 0.0
+
+    def _detect_fw(self, audio):
+        # info is filled before any decoding; the lazy segment generator is never consumed
+        _, info = self.fw_model.transcribe(audio, beam_size=1)
+        return info.language, float(info.language_probability)
+
+    def _prime(self):
+        """One encoder pass on silence so kernels/allocator are warm before the first request."""
+        audio = np.zeros(whisper.audio.N_SAMPLES, dtype=np.float32)
+        if self.ecapa is not None:
+            self._detect_ecapa(audio[:16000])
+            return
+        if self.fw_model is not None:
+            self._detect_fw(audio)
+            return
+        mel = _mel(self.model, audio)
+        with torch.inference_mode(), whisper_autocast(self.model.device):
+            self.model.detect_language(mel)
 
     def detect(self, audio_path, duration_limit=None):
-        print(f"🧠 Detecting language using Whisper transcription (Limit: {duration_limit}s)...")
+        print(f"🧠 Detecting language using Whisper (Limit: {duration_limit}s)...")
         try:
-            # Load audio using Whisper's internal utility to get 16kHz mono array
-            audio = whisper.load_audio(audio_path)
+            # 16kHz mono array; callers may pass an already decoded ndarray
+            audio = load_audio_array(audio_path)
             
             # Trim if needed (Whisper expects 16kHz)
             if duration_limit:
                 samples = int(duration_limit * 16000)
                 if len(audio) > samples:
                     audio = audio[:samples]
+
+            # Drop silence so the 30 s LID window is filled with speech; two
+            # minutes of input is plenty to find it.
+            audio = vad_trim(audio[:120 * 16000])
+
+            if self.ecapa is not None:
+                # ECAPA pools over the whole utterance: no 30 s padding
+                detected_lang, confidence = self._detect_ecapa(audio)
+                if detected_lang is None:
+                    return None, {}
+                print(f"✅ ECAPA LID: {detected_lang} (Confidence: {confidence:.2f})")
+                return detected_lang, {detected_lang: confidence}
             
-            # Pad or Trim to 30s is handled by log_mel_spectrogram usually, 
-            # but transcribe handles raw audio directly.
-            result = self.model.transcribe(audio, task="transcribe", language=None, fp16=False)
-            
-            detected_lang = result.get("language")  # Code like 'bn'
-            
-            # Attempt to extract confidence if available in segments or result
-            # Whisper 'transcribe' result usually just has 'language'. 
-            # To get confidence we might need to look at segments or internal logits if we used detect_language()
-            # But standard transcribe results don't always expose language confidence top-level easily.
-            # However, for this task, we will assume 1.0 or try to parse.
-            # Actually, using model.detect_language() is more appropriate for LID!
-            
-            # Let's switch to model.detect_language() which is efficient for LID (Encoder only)
-            # It requires computing Mel spectrogram first.
-            
+            # LID only needs the encoder on the first 30 s: no decoder pass
             audio = whisper.pad_or_trim(audio)
-            mel = whisper.log_mel_spectrogram(audio).to(self.model.device)
+            if self.fw_model is not None:
+                detected_lang, confidence = self._detect_fw(audio)
+                print(f"✅ Whisper LID: {detected_lang} (Confidence: {confidence:.2f})")
+                return detected_lang, {detected_lang: confidence}
+
+            mel = _mel(self.model, audio)
             
             # detect the spoken language
-            _, probs = self.model.detect_language(mel)
-            detected_lang = max(probs, key=probs.get)
-            confidence = probs[detected_lang]
+            with torch.inference_mode(), whisper_autocast(self.model.device):
+                _, probs = self.model.detect_language(mel)
+            codes = list(probs)
+            scores = np.fromiter(probs.values(), dtype=np.float32, count=len(codes))
+            best = int(scores.argmax())
+            detected_lang = codes[best]
+            confidence = float(scores[best])
             
             print(f"✅ Whisper LID: {detected_lang} (Confidence: {confidence:.2f})")
             return detected_lang, {detected_lang: confidence}
@@ -76,8 +260,8 @@ class LanguageIdentifier:
 def detect_dialect(audio_path):
     try:
         print("🌐 Detecting dialect...")
-        model = whisper.load_model("small")
-        result = model.transcribe(audio_path)
+        model = get_whisper("small")
+        result = model.transcribe(load_audio_array(audio_path), fp16=model.device.type == "cuda")
         lang_code, _ = classify(result['text'])
         return lang_code
     except Exception as e:
@@ -91,11 +275,51 @@ def extract_audio_ffmpeg(video_path):
     subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     return temp_audio
 
+def _av_to_np(path, sample_rate=16000):
+    src = io.BytesIO(path) if isinstance(path, (bytes, bytearray)) else path
+    with av.open(src) as container:
+        stream = container.streams.audio[0]
+        stream.thread_type = "AUTO"
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=sample_rate)
+        parts = []
+        for frame in container.decode(stream):
+            parts.extend(f.to_ndarray().reshape(-1) for f in resampler.resample(frame))
+        parts.extend(f.to_ndarray().reshape(-1) for f in resampler.resample(None))
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+def _decode_to_np(path, sample_rate=16000):
+    """Decode in-process with PyAV when installed, otherwise through an ffmpeg pipe. path may also be raw file bytes."""
+    if av is not None:
+        try:
+            return _av_to_np(path, sample_rate)
+        except Exception as e:
+            print(f"⚠️ PyAV decode failed ({e}); falling back to ffmpeg.")
+    return _ffmpeg_to_np(path, sample_rate)
+
+def _ffmpeg_to_np(path, sample_rate=16000):
+    if isinstance(path, (bytes, bytearray)):
+        cmd = ["ffmpeg", "-i", "pipe:0", "-vn", "-f", "f32le", "-ac", "1", "-ar", str(sample_rate), "-"]
+        proc = subprocess.run(cmd, input=bytes(path), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        if proc.returncode != 0:
+            raise RuntimeError("ffmpeg failed to decode in-memory audio")
+        return np.frombuffer(proc.stdout, dtype=np.float32)
+    cmd = ["ffmpeg", "-nostdin", "-i", path, "-vn", "-f", "f32le", "-ac", "1", "-ar", str(sample_rate), "-"]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    out = proc.stdout.read()
+    if proc.wait() != 0:
+        raise RuntimeError(f"ffmpeg failed to decode {path}")
+    return np.frombuffer(out, dtype=np.float32)
+
+def extract_audio_array(video_path, sample_rate=16000):
+    """Decode a video's audio track straight into a float32 array (no WAV on disk)."""
+    print("🎬 Extracting audio from video...")
+    return _decode_to_np(video_path, sample_rate)
+
 def download_youtube_audio(url):
     """
     ⬇️ Robust YouTube audio downloader:
-    - Requests best available audio (any codec/bitrate)
-    - Converts to WAV using ffmpeg (via yt-dlp postprocessor)
+    - Requests audio-only at <=128 kbps when offered (speech needs no more), else best audio
+    - Converts once to 16 kHz mono WAV using ffmpeg (via yt-dlp postprocessor)
     - Retries on transient errors / format availability issues
     - Returns the actual .wav path
     """
@@ -106,7 +330,7 @@ def download_youtube_audio(url):
 
     # yt-dlp options to be resilient against format unavailability and 403s
     ydl_opts = {
-        "format": "bestaudio/best",          # ✅ Let yt-dlp pick the best available audio
+        "format": "bestaudio[abr<=128]/bestaudio/best",
         "outtmpl": outtmpl,
         "noplaylist": True,
         "quiet": False,                      # keep some logging (helps debugging)
@@ -131,13 +355,13 @@ def download_youtube_audio(url):
                 "preferredquality": "192",   # bitrate for source; WAV is PCM anyway
             }
         ],
-        # Ensure ffmpeg writes a standard PCM wav (mono downmix & 16k can be done by your ASR later)
-        # If you prefer to force 16k mono right here, uncomment:
-        # "postprocessor_args": ["-ar", "16000", "-ac", "1"],
+        # Resample/downmix in the same ffmpeg pass: the ASR/LID models want 16k mono
+        # anyway, and a full-rate stereo WAV is ~6x larger to write and re-decode.
+        "postprocessor_args": {"extractaudio": ["-ar", "16000", "-ac", "1"]},
     }
 
     # Try a couple of times with slight format variations if needed
-    attempted_formats = ["bestaudio/best", "ba* / b* / best"]  # second is a very relaxed fallback
+    attempted_formats = ["bestaudio[abr<=128]/bestaudio/best", "ba* / b* / best"]  # second is a very relaxed fallback
     last_err = None
 
     for fmt in attempted_formats:
@@ -183,11 +407,13 @@ def download_youtube_audio(url):
     # If all attempts failed, re-raise the last error so caller can handle/log it
     raise RuntimeError(f"YouTube download failed: {last_err}")
 
-def record_live_audio(duration=5, sample_rate=16000):
+def record_live_audio(duration=5, sample_rate=16000, return_array=False):
     print("🎤 Speak now...")
     audio = sd.rec(int(duration * sample_rate), samplerate=sample_rate, channels=1, dtype='float32')
     sd.wait()
     print("✅ Recording complete.")
+    if return_array:
+        return audio.reshape(-1)
     out_path = os.path.join(os.getcwd(), "recorded.wav")
     write(out_path, sample_rate, (audio * 32767).astype(np.int16))
     print(f"💾 Audio saved to {out_path}")
@@ -216,11 +442,11 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     if args.file:
-        audio_path = extract_audio_ffmpeg(args.file) if args.file.lower().endswith(('.mp4', '.mkv', '.mov', '.avi')) else args.file
+        audio_path = extract_audio_array(args.file) if args.file.lower().endswith(('.mp4', '.mkv', '.mov', '.avi')) else args.file
     elif args.youtube:
         audio_path = download_youtube_audio(args.youtube)
     elif args.mic:
-        audio_path = record_live_audio(duration=args.duration)
+        audio_path = record_live_audio(duration=args.duration, return_array=True)
     else:
         print("❗ No valid input source.")
         exit(1)
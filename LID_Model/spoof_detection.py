@@ -1,30 +1,26 @@
 # spoof_detection.py
 import torchaudio
 import subprocess
-import tempfile
 import os
 import soundfile as sf  # Ensure soundfile is available
+import numpy as np
+import torch
 
 # ✅ Force compatible backend
 torchaudio.set_audio_backend("soundfile")
 
-def reencode_audio(audio_path):
-    """Ensure file is in 16kHz mono WAV format."""
-    reencoded = tempfile.mktemp(suffix=".wav")
-    cmd = [
-        "ffmpeg", "-y",
-        "-i", audio_path,
-        "-ar", "16000",
-        "-ac", "1",
-        reencoded
-    ]
-    subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    return reencoded
+def decode_audio(audio_path):
+    """Decode to 16kHz mono float32 through an ffmpeg pipe instead of a re-encoded temp WAV."""
+    cmd = ["ffmpeg", "-nostdin", "-i", audio_path, "-f", "f32le", "-ac", "1", "-ar", "16000", "-"]
+    out = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True).stdout
+    return torch.from_numpy(np.frombuffer(out, dtype=np.float32).copy()).unsqueeze(0)
 
 def is_spoofed_audio(audio_path, threshold=1e-4):
     try:
-        fixed_path = reencode_audio(audio_path)
-        waveform, sr = torchaudio.load(fixed_path)
+        if isinstance(audio_path, np.ndarray):
+            waveform = torch.from_numpy(audio_path.reshape(1, -1))
+        else:
+            waveform = decode_audio(audio_path)
 
         if waveform.shape[0] == 0 or waveform.abs().mean().item() < threshold:
             print("⚠️ Detected low energy or empty waveform.")
@@ -0,0 +1,39 @@
+# MT_Model/lang_maps.py
+"""
+Language-code tables shared by the pipeline, the server, MT and TTS.
+Read-only views, so every importer sees the same single source of truth.
+"""
+
+from types import MappingProxyType
+
+# ISO 639 -> FLORES-200 (IndicTrans2 / NLLB codes)
+ISO_TO_FLORES = MappingProxyType({
+    "en": "eng_Latn", "hi": "hin_Deva", "bn": "ben_Beng", "as": "asm_Beng",
+    "gu": "guj_Gujr", "kn": "kan_Knda", "ml": "mal_Mlym", "mr": "mar_Deva",
+    "ne": "npi_Deva", "or": "ory_Orya", "pa": "pan_Guru", "sa": "san_Deva",
+    "ta": "tam_Taml", "te": "tel_Telu", "ur": "urd_Arab", "ks": "kas_Arab",
+    "sd": "snd_Arab", "brx": "brx_Deva", "doi": "doi_Deva", "mai": "mai_Deva",
+    "kok": "kok_Deva", "mni": "mni_Beng", "sat": "sat_Olck",
+    "es": "spa_Latn", "fr": "fra_Latn", "de": "deu_Latn", "it": "ita_Latn",
+    "pt": "por_Latn", "ru": "rus_Cyrl", "zh": "zho_Hans", "ja": "jpn_Jpan",
+    "ko": "kor_Hang", "ar": "arb_Arab", "fa": "pes_Arab", "tr": "tur_Latn",
+    "id": "ind_Latn",
+})
+
+FLORES_TO_ISO = MappingProxyType({v: k for k, v in ISO_TO_FLORES.items()})
+
+# Languages supported by IndicConformer ASR (ISO codes)
+CONFORMER_LANGS = frozenset({
+    'as', 'bn', 'brx', 'doi', 'gu', 'hi', 'kn', 'kok', 'ks', 'mai', 'ml', 'mni', 'mr', 'ne',
+    'or', 'pa', 'sa', 'sat', 'sd', 'ta', 'te', 'ur'
+})
+
+
+def to_flores(code, default=None):
+    """ISO -> FLORES; FLORES codes pass through unchanged."""
+    if "_" in str(code):
+        return code
+    return ISO_TO_FLORES.get(str(code).lower(), default)
+
+
+__all__ = ["ISO_TO_FLORES", "FLORES_TO_ISO", "CONFORMER_LANGS", "to_flores"]
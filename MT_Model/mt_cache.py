@@ -0,0 +1,42 @@
+# MT_Model/mt_cache.py
+"""
+Process-wide LRU of finished translations, shared by the local models (mt_model) and Google (mt_google).
+Keys are (backend, src, tgt, options..., text): repeated chunks (fillers, boilerplate,
+re-sent streaming partials) are translated once per process.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+MT_CACHE_SIZE = int(os.getenv("VASHA_MT_CACHE_SIZE", "4096"))
+_mt_cache = OrderedDict()
+_mt_cache_lock = threading.Lock()
+
+
+def cached_translate(key, texts, translate_fn, cacheable=None):
+    """
+    Run translate_fn on the unique, uncached texts only and scatter results back in order.
+    cacheable(text, out) -> bool decides what is stored (failures must not be).
+    """
+    results = {}
+    with _mt_cache_lock:
+        for t in texts:
+            hit = _mt_cache.get(key + (t,))
+            if hit is not None:
+                _mt_cache.move_to_end(key + (t,))
+                results[t] = hit
+    todo = [t for t in dict.fromkeys(texts) if t not in results]
+    if todo:
+        outs = translate_fn(todo)
+        with _mt_cache_lock:
+            for t, out in zip(todo, outs):
+                results[t] = out
+                if MT_CACHE_SIZE > 0 and (cacheable is None or cacheable(t, out)):
+                    _mt_cache[key + (t,)] = out
+            while len(_mt_cache) > MT_CACHE_SIZE:
+                _mt_cache.popitem(last=False)
+    return [results[t] for t in texts]
+
+
+__all__ = ["MT_CACHE_SIZE", "cached_translate"]
@@ -11,7 +11,12 @@ Notes:
 
 import os
 import time
+import random
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+from MT_Model.sentence_split import split_sentences
+from MT_Model.mt_cache import cached_translate
 
 try:
     from googletrans import Translator
@@ -81,8 +86,13 @@ def _ensure_translator():
             raise ImportError(
                 "googletrans not available. Install with: pip install googletrans==4.0.0-rc1"
             )
+        # One instance for the process: it owns a single pooled (HTTP/2) httpx client,
+        # so concurrent requests reuse connections instead of new TCP/TLS handshakes.
         # You can pass service_urls if translation fails in your region.
-        _google_translator = Translator()
+        try:
+            _google_translator = Translator(timeout=10)
+        except TypeError:
+            _google_translator = Translator()
     return _google_translator
 
 
@@ -107,6 +117,51 @@ def _normalize_for_google(code: str) -> str:
     return FALLBACK_SCRIPT_MAP.get(lc, lc)
 
 
+def _translate_one(t_text: str, src_code: str, tgt_code: str, retry: int, sleep_between_retries: float) -> str:
+    translator = _ensure_translator()
+    attempt = 0
+    last_exc = None
+    while attempt <= retry:
+        try:
+            # googletrans accepts a single string; sometimes it accepts a list
+            res = translator.translate(t_text, src=src_code, dest=tgt_code)
+            # res may be a single object
+            txt = getattr(res, "text", None)
+            if txt is None and isinstance(res, list) and len(res) > 0:
+                txt = getattr(res[0], "text", t_text)
+            return txt if txt is not None else t_text
+        except Exception as e:
+            last_exc = e
+            attempt += 1
+            if attempt > retry:
+                break
+            # exponential backoff with jitter; rate limiting (429) waits longer
+            delay = sleep_between_retries * (2 ** (attempt - 1)) * random.uniform(0.8, 1.2)
+            if "429" in str(e) or "Too Many Requests" in str(e):
+                delay *= 4
+            time.sleep(delay)
+    # exhausted retries → fallback to original chunk
+    print(f"⚠️ Google Translate failed for chunk (src={src_code}, tgt={tgt_code}): {last_exc}")
+    return t_text
+
+
+def _pack_texts(texts: t.List[str], pack_chars: int) -> t.List[t.List[int]]:
+    """Group indices of single-line texts into newline-joined requests of <= pack_chars."""
+    packs, cur, cur_len = [], [], 0
+    for i, x in enumerate(texts):
+        if "\n" in x or len(x) >= pack_chars:
+            packs.append([i])
+            continue
+        if cur and cur_len + len(x) + 1 > pack_chars:
+            packs.append(cur)
+            cur, cur_len = [], 0
+        cur.append(i)
+        cur_len += len(x) + 1
+    if cur:
+        packs.append(cur)
+    return packs
+
+
 def translate_google_list(
     texts: t.List[str],
     src: str,
@@ -114,38 +169,52 @@ def translate_google_list(
     save_path: t.Optional[str] = None,
     retry: int = 2,
     sleep_between_retries: float = 1.0,
+    max_workers: int = 16,
+    pack_chars: int = 4500,
 ) -> t.List[str]:
     """
     Translate a list of short texts (sentences) using googletrans.
-    Returns list of translations (same length).
+    Short texts are packed one-per-line into requests of up to `pack_chars` characters,
+    and requests are network-bound, so up to `max_workers` run concurrently.
+    Returns list of translations (same length, same order); repeated texts hit the shared MT LRU.
     On repeated failure for a chunk, returns the original chunk (graceful fallback).
     """
-    translator = _ensure_translator()
+    _ensure_translator()
     src_code = _normalize_for_google(src)
     tgt_code = _normalize_for_google(tgt)
 
-    outputs: t.List[str] = []
-    for t_text in texts:
-        attempt = 0
-        last_exc = None
-        while attempt <= retry:
-            try:
-                # googletrans accepts a single string; sometimes it accepts a list
-                res = translator.translate(t_text, src=src_code, dest=tgt_code)
-                # res may be a single object
-                txt = getattr(res, "text", None)
-                if txt is None and isinstance(res, list) and len(res) > 0:
-                    txt = getattr(res[0], "text", t_text)
-                outputs.append(txt if txt is not None else t_text)
-                break
-            except Exception as e:
-                last_exc = e
-                attempt += 1
-                time.sleep(sleep_between_retries)
+    def _one(t_text):
+        return _translate_one(t_text, src_code, tgt_code, retry, sleep_between_retries)
+
+    def _translate(items):
+        def _pack(idx):
+            if len(idx) == 1:
+                return [_one(items[idx[0]])]
+            joined = "\n".join(items[i] for i in idx)
+            lines = _one(joined).split("\n")
+            if len(lines) == len(idx):
+                return lines
+            # Google merged or split lines; translate this pack item by item instead
+            return [_one(items[i]) for i in idx]
+
+        packs = _pack_texts(items, pack_chars) if pack_chars else [[i] for i in range(len(items))]
+        workers = max(1, min(max_workers, len(packs)))
+        if workers == 1:
+            results = [_pack(p) for p in packs]
         else:
-            # exhausted retries → fallback to original chunk
-            print(f"⚠️ Google Translate failed for chunk (src={src_code}, tgt={tgt_code}): {last_exc}")
-            outputs.append(t_text)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_pack, packs))
+        outs: t.List[str] = [""] * len(items)
+        for idx, res in zip(packs, results):
+            for i, out in zip(idx, res):
+                outs[i] = out
+        return outs
+
+    # Only uncached sentences go over the network; a failed chunk comes back unchanged and is not cached
+    outputs = cached_translate(
+        ("google", src_code, tgt_code), list(texts), _translate,
+        cacheable=lambda src_text, out: out != src_text,
+    )
 
     if save_path:
         try:
@@ -175,10 +244,8 @@ def translate_joined(
     - Calls translate_google_list for chunked items
     - Re-joins output and returns single string
     """
-    import re
-
     # lightweight sentence split
-    sents = [s.strip() for s in re.split(r'(?<=[\.\?\!])\s+', text) if s.strip()]
+    sents = split_sentences(text)
     if not sents:
         # fallback: treat all text as one chunk
         chunks = [text.strip()]
@@ -118,25 +118,32 @@ def perform_translation(
     translit_scheme: str = "ITRANS",
     code_mixed_english_action: str = "pass",
     ner_preserve: bool = False,
+    num_beams: int = 1,
 ) -> str:
     """
     Unified translation entrypoint with preprocessing (NER, translit, code-mixed).
+    num_beams=1 is greedy (real-time default); pass mm.HIGH_QUALITY_BEAMS for quality mode.
     """
 
     src_flores = src_lang if "_" in src_lang else ISO_TO_FLORES.get(src_lang, src_lang)
 
+    # Same language in and out: nothing to translate (transliteration / code-mixed
+    # modes still run, they change script or translate embedded English runs)
+    if src_flores == tgt_flores and mode not in ("transliterate", "code_mixed"):
+        return text
+
     # Base translation function for preprocessor to call
     def _base_translate(txt, s, t, **kwargs):
         choice = (backend_choice or auto_select_backend(s, t)).lower()
         if choice == "indic":
-            return mm.translate_text(txt, s, t, mt_model_choice="indic", use_processor=use_processor)
+            return mm.translate_text(txt, s, t, mt_model_choice="indic", use_processor=use_processor, num_beams=num_beams)
         elif choice == "nllb":
-            return mm.translate_text(txt, s, t, mt_model_choice="nllb")
+            return mm.translate_text(txt, s, t, mt_model_choice="nllb", num_beams=num_beams)
         elif choice == "google":
             return mt_google.translate_joined(txt, s, t)
         else:
             # fallback to nllb always instead of auto→indic crash
-            return mm.translate_text(txt, s, t, mt_model_choice="nllb")
+            return mm.translate_text(txt, s, t, mt_model_choice="nllb", num_beams=num_beams)
 
     # Delegate to preprocessor
     return mt_preprocessor.preprocess_and_translate(
@@ -165,10 +172,25 @@ def batch_translate_via_perform(
     code_mixed_english_action: str = "pass",
     ner_preserve: bool = False,
     max_chunk_size: int = 1800,
+    num_beams: int = 1,
 ) -> str:
     sentences = mm._split_into_sentences(text)
     chunks = mm._group_sentences(sentences, char_limit=max_chunk_size)
 
+    # Plain MT on a model backend: send every chunk through the model together
+    # (length-bucketed generate() batches) instead of one generate() per chunk.
+    src_flores = src_iso if "_" in src_iso else ISO_TO_FLORES.get(src_iso, src_iso)
+    choice = (backend_choice or auto_select_backend(src_flores, tgt_flores)).lower()
+    if mode not in ("transliterate", "code_mixed") and not ner_preserve and choice != "google":
+        try:
+            outputs = mm.translate_batch(
+                chunks, src_flores, tgt_flores, mt_model_choice="indic" if choice == "indic" else "nllb",
+                num_beams=num_beams,
+            )
+            return " ".join(outputs).strip()
+        except Exception as e:
+            print(f"⚠️ Batched translation failed, translating chunk by chunk: {e}")
+
     outputs = []
     for chunk in tqdm(chunks, desc="🌍 Translating", unit="chunk"):   # ✅ real-time loading bar
         try:
@@ -182,6 +204,7 @@ def batch_translate_via_perform(
                 translit_scheme=translit_scheme,
                 code_mixed_english_action=code_mixed_english_action,
                 ner_preserve=ner_preserve,
+                num_beams=num_beams,
             )
             outputs.append(out)
         except Exception as e:
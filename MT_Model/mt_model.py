@@ -1,6 +1,12 @@
+import os
 import torch
 import re
+import threading
+import numpy as np
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from MT_Model.sentence_split import split_sentences
+from MT_Model.lang_maps import ISO_TO_FLORES, FLORES_TO_ISO as _FLORES_TO_ISO, to_flores
+from MT_Model.mt_cache import cached_translate
 
 # Try to import IndicProcessor (two possible package names)
 try:
@@ -14,29 +20,170 @@ except Exception:
         IndicProcessor = None
         _HAS_INDIC_TOOLKIT = False
 
-_indic_ip_cache = {}
-def _get_indic_processor(model_name: str):
+# Serializes model/tokenizer loads so concurrent server requests don't load the same weights twice
+_LOAD_LOCK = threading.RLock()
+
+# IndicProcessor is direction-agnostic but not stateless: preprocess_batch queues one
+# placeholder->entity map per sentence and postprocess_batch pops them in FIFO order.
+# One instance per thread, and every preprocess is matched by a postprocess of the same rows.
+_indic_ip_local = threading.local()
+def _get_indic_processor(model_name: str = None):
     if not _HAS_INDIC_TOOLKIT:
         return None
-    if model_name not in _indic_ip_cache:
+    ip = getattr(_indic_ip_local, "ip", None)
+    if ip is None:
         try:
-            _indic_ip_cache[model_name] = IndicProcessor(inference=True)
+            ip = IndicProcessor(inference=True)
         except TypeError:
-            _indic_ip_cache[model_name] = IndicProcessor()
-    return _indic_ip_cache[model_name]
+            ip = IndicProcessor()
+        _indic_ip_local.ip = ip
+    return ip
 
 # -----------------------------
 # Config
 # -----------------------------
 NLLB_MODEL_NAME = "facebook/nllb-200-distilled-1.3B"
 device = "cuda" if torch.cuda.is_available() else "cpu"
+try:
+    import bitsandbytes  # noqa: F401  (pip install bitsandbytes; CUDA int8 weights)
+    from transformers import BitsAndBytesConfig
+    _HAS_BNB = True
+except Exception:
+    _HAS_BNB = False
+
+# VASHA_MT_DTYPE: fp16 | bf16 | fp32 | int8
+# int8 = dynamic quantization of Linear layers on CPU; bitsandbytes LLM.int8() weights on CUDA
+MT_COMPUTE_TYPE = os.getenv("VASHA_MT_DTYPE", "fp16" if device == "cuda" else "int8").strip().lower()
+if MT_COMPUTE_TYPE == "int8" and device == "cuda" and not _HAS_BNB:
+    print("⚠️ VASHA_MT_DTYPE=int8 on CUDA needs bitsandbytes; using fp16")
+    MT_COMPUTE_TYPE = "fp16"
+MT_BNB_INT8 = MT_COMPUTE_TYPE == "int8" and device == "cuda"
+MT_DTYPE = {"fp16": torch.float16, "bf16": torch.bfloat16}.get(MT_COMPUTE_TYPE, torch.float32)
+if device == "cpu" and MT_DTYPE == torch.float16:
+    MT_DTYPE = torch.float32  # fp16 matmuls are slow or unsupported on most CPUs
+if MT_BNB_INT8:
+    MT_DTYPE = torch.float16  # non-Linear weights (embeddings, LayerNorm) and activations stay fp16
+
+
+try:
+    import flash_attn  # noqa: F401  (pip install flash-attn; CUDA fp16/bf16 only)
+    _HAS_FLASH_ATTN = True
+except Exception:
+    _HAS_FLASH_ATTN = False
+
+
+def _attn_candidates():
+    if _HAS_FLASH_ATTN and device == "cuda" and MT_DTYPE in (torch.float16, torch.bfloat16):
+        return ("flash_attention_2", "sdpa")
+    return ("sdpa",)
+
+
+def _from_pretrained_fast_attn(model_name, **kwargs):
+    if MT_BNB_INT8:
+        # Linear weights are quantized while loading and placed on the GPU directly
+        kwargs.setdefault("quantization_config", BitsAndBytesConfig(load_in_8bit=True, llm_int8_threshold=6.0))
+        kwargs.setdefault("device_map", {"": torch.cuda.current_device()})
+    # FlashAttention-2 / fused SDPA where the architecture supports it (transformers >= 4.36)
+    for attn in _attn_candidates():
+        try:
+            return AutoModelForSeq2SeqLM.from_pretrained(model_name, attn_implementation=attn, **kwargs)
+        except (TypeError, ValueError, ImportError):
+            continue
+    return AutoModelForSeq2SeqLM.from_pretrained(model_name, **kwargs)
+
+
+# Opt-in (VASHA_MT_COMPILE=1): compilation costs tens of seconds on first use and
+# only pays off in a long-running process such as the server.
+MT_COMPILE = os.getenv("VASHA_MT_COMPILE", "0") == "1"
+# Opt-in (VASHA_MT_CUDAGRAPH=1, CUDA only): compile in reduce-overhead mode so each decoder
+# step is replayed as a CUDA graph. A graph is recorded per padded input shape, which the
+# length buckets and pad-to-8 keep to a handful; implies compilation.
+MT_CUDAGRAPH = device == "cuda" and os.getenv("VASHA_MT_CUDAGRAPH", "0") == "1"
+
+
+def _maybe_compile(model):
+    if not (MT_COMPILE or MT_CUDAGRAPH) or MT_COMPUTE_TYPE == "int8" or not hasattr(torch, "compile"):
+        return model
+    mode = "reduce-overhead" if MT_CUDAGRAPH else "default"
+    try:
+        # compile forward only: generate() stays a plain Python loop calling the compiled step.
+        # dynamic=True avoids a recompile per batch/sequence length; CUDA graphs need concrete shapes.
+        model.forward = torch.compile(model.forward, mode=mode, fullgraph=False, dynamic=None if MT_CUDAGRAPH else True)
+        print(f"[INFO] torch.compile enabled for MT model forward ({mode})")
+    except Exception as e:
+        print(f"⚠️ torch.compile unavailable for MT model: {e}")
+    return model
+
+
+def _prepare_for_inference(model):
+    # bitsandbytes models are already on the GPU and do not support .to()
+    model = (model if MT_BNB_INT8 else model.to(device)).eval()
+    model.requires_grad_(False)
+    if MT_COMPUTE_TYPE == "int8" and not MT_BNB_INT8:
+        try:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        except Exception as e:
+            print(f"⚠️ int8 dynamic quantization failed, keeping fp32: {e}")
+    return model
 
 # -----------------------------
-# Load NLLB
+# Load NLLB (lazily, on first NLLB translation)
 # -----------------------------
-print(f"[INFO] Loading NLLB model: {NLLB_MODEL_NAME} on {device} ...")
-nllb_tokenizer = AutoTokenizer.from_pretrained(NLLB_MODEL_NAME)
-nllb_model = AutoModelForSeq2SeqLM.from_pretrained(NLLB_MODEL_NAME).to(device)
+nllb_tokenizer = None
+nllb_model = None
+
+def _get_nllb_tokenizer():
+    global nllb_tokenizer
+    if nllb_tokenizer is None:
+        with _LOAD_LOCK:
+            if nllb_tokenizer is None:
+                nllb_tokenizer = AutoTokenizer.from_pretrained(NLLB_MODEL_NAME)
+    return nllb_tokenizer
+
+def _load_nllb_model():
+    global nllb_model
+    if nllb_model is None:
+        with _LOAD_LOCK:
+            if nllb_model is None:
+                print(f"[INFO] Loading NLLB model: {NLLB_MODEL_NAME} on {device} ...")
+                nllb_model = _maybe_compile(_prepare_for_inference(
+                    _from_pretrained_fast_attn(NLLB_MODEL_NAME, torch_dtype=MT_DTYPE)
+                ))
+    return _get_nllb_tokenizer(), nllb_model
+
+# -----------------------------
+# Optional CTranslate2 int8 NLLB
+# Convert once with:
+#   ct2-transformers-converter --model facebook/nllb-200-distilled-1.3B \
+#       --output_dir ct2/nllb --quantization int8
+# -----------------------------
+try:
+    import ctranslate2
+except Exception:
+    ctranslate2 = None
+
+CT2_DIR = os.getenv("VASHA_CT2_DIR", "ct2")
+_nllb_ct2 = None
+_nllb_ct2_failed = False
+
+def _load_nllb_ct2():
+    global _nllb_ct2, _nllb_ct2_failed
+    if _nllb_ct2 is None and not _nllb_ct2_failed:
+        with _LOAD_LOCK:
+            if _nllb_ct2 is not None or _nllb_ct2_failed:
+                return _nllb_ct2
+            path = os.path.join(CT2_DIR, "nllb")
+            if ctranslate2 is None or not os.path.isdir(path):
+                _nllb_ct2_failed = True
+                return None
+            try:
+                compute_type = "int8_float16" if device == "cuda" else "int8"
+                _nllb_ct2 = ctranslate2.Translator(path, device=device, compute_type=compute_type)
+                print(f"[INFO] Using CTranslate2 NLLB from {path} ({compute_type})")
+            except Exception as e:
+                print(f"⚠️ CTranslate2 NLLB init failed, using transformers: {e}")
+                _nllb_ct2_failed = True
+    return _nllb_ct2
 
 # -----------------------------
 # IndicTrans2 model names
@@ -49,14 +196,19 @@ _indic_tokenizers = {}
 _indic_models = {}
 
 def _load_indic_model(model_name):
-    if model_name in _indic_tokenizers:
+    if model_name in _indic_models:
         return _indic_tokenizers[model_name], _indic_models[model_name]
-    print(f"⚡ Loading {model_name} ... (this may take a while)")
-    tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
-    model = AutoModelForSeq2SeqLM.from_pretrained(model_name, trust_remote_code=True).to(device)
-    _indic_tokenizers[model_name] = tokenizer
-    _indic_models[model_name] = model
-    return tokenizer, model
+    with _LOAD_LOCK:
+        if model_name not in _indic_models:
+            print(f"⚡ Loading {model_name} ... (this may take a while)")
+            tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
+            model = _maybe_compile(_prepare_for_inference(
+                _from_pretrained_fast_attn(model_name, trust_remote_code=True, torch_dtype=MT_DTYPE)
+            ))
+            _indic_tokenizers[model_name] = tokenizer
+            # models dict is written last: it is what the lock-free fast path checks
+            _indic_models[model_name] = model
+    return _indic_tokenizers[model_name], _indic_models[model_name]
 
 # -----------------------------
 # Indic Languages (FLORES codes)
@@ -69,52 +221,48 @@ INDIC_LANGS = {
     "mni_Mtei", "gom_Deva"
 }
 
-# -----------------------------
-# ISO → FLORES Mapping
-# -----------------------------
-ISO_TO_FLORES = {
-    "en": "eng_Latn", "hi": "hin_Deva", "bn": "ben_Beng", "as": "asm_Beng",
-    "gu": "guj_Gujr", "kn": "kan_Knda", "ml": "mal_Mlym", "mr": "mar_Deva",
-    "ne": "npi_Deva", "or": "ory_Orya", "pa": "pan_Guru", "sa": "san_Deva",
-    "ta": "tam_Taml", "te": "tel_Telu", "ur": "urd_Arab", "ks": "kas_Arab",
-    "sd": "snd_Arab", "brx": "brx_Deva", "doi": "doi_Deva", "mai": "mai_Deva",
-    "kok": "kok_Deva", "mni": "mni_Beng", "sat": "sat_Olck",
-    "es": "spa_Latn", "fr": "fra_Latn", "de": "deu_Latn", "it": "ita_Latn",
-    "pt": "por_Latn", "ru": "rus_Cyrl", "zh": "zho_Hans", "ja": "jpn_Jpan",
-    "ko": "kor_Hang", "ar": "arb_Arab", "fa": "pes_Arab", "tr": "tur_Latn",
-    "id": "ind_Latn",
-}
-
 # -----------------------------
 # Helpers
 # -----------------------------
+_WS_RE = re.compile(r"\s+")
+
 def _split_into_sentences(text: str):
-    text = re.sub(r"\s+", " ", text).strip()
-    return re.split(r'(?<=[\.\?\!])\s+', text)
+    return split_sentences(_WS_RE.sub(" ", text).strip())
 
 def _group_sentences(sentences, char_limit=2000):
-    chunks, cur, cur_len = [], [], 0
-    for s in sentences:
-        if cur_len + len(s) + 1 <= char_limit:
-            cur.append(s)
-            cur_len += len(s) + 1
-        else:
-            chunks.append(" ".join(cur))
-            cur, cur_len = [s], len(s)
-    if cur:
-        chunks.append(" ".join(cur))
+    """Greedy packing into chunks of <= char_limit chars (a longer sentence stands alone)."""
+    n = len(sentences)
+    if n == 0:
+        return []
+    # cum[i] = joined length of sentences[:i+1] plus one trailing space each
+    cum = np.cumsum(np.fromiter((len(s) + 1 for s in sentences), dtype=np.int64, count=n))
+    chunks, start = [], 0
+    while start < n:
+        base = cum[start - 1] if start else 0
+        end = max(int(np.searchsorted(cum, base + char_limit, side="right")), start + 1)
+        chunks.append(" ".join(sentences[start:end]))
+        start = end
     return chunks
 
+def _cached_translate(key, texts, translate_fn):
+    return cached_translate(key, texts, translate_fn, cacheable=lambda _, out: out != "[translation_error]")
+
 # -----------------------------
 # Batch Translation API (NEW)
 # -----------------------------
 def batch_translate_text(text: str, src_flores: str, tgt_flores: str, mt_model_choice="auto", max_chunk_size: int = 1800) -> str:
     """
-    Splits input into manageable chunks and translates each sequentially.
+    Splits input into manageable chunks and translates them together in
+    length-bucketed batches; falls back to one chunk at a time on error.
     """
     sentences = _split_into_sentences(text)
     chunks = _group_sentences(sentences, char_limit=max_chunk_size)
 
+    try:
+        return " ".join(translate_batch(chunks, src_flores, tgt_flores, mt_model_choice=mt_model_choice)).strip()
+    except Exception as e:
+        print(f"⚠️ Batched translation failed, translating chunk by chunk: {e}")
+
     outputs = []
     for chunk in chunks:
         try:
@@ -128,13 +276,31 @@ def batch_translate_text(text: str, src_flores: str, tgt_flores: str, mt_model_c
 # -----------------------------
 # IndicTrans2 Translation
 # -----------------------------
-def _encode_for_indictrans(tokenizer, text, src_flores, tgt_flores, model_name, device):
-    batch = [text]
-    ip = _get_indic_processor(model_name)
-    if ip is not None:
-        prepped = ip.preprocess_batch(batch, src_lang=src_flores, tgt_lang=tgt_flores)
-        enc = tokenizer(prepped, return_tensors="pt", padding=True, truncation=True)
-        return {k: v.to(device) for k, v in enc.items()}
+def _bucket_by_length(lengths, max_batch_tokens=4096, max_spread=1.2, slack=8):
+    """
+    Group indices by ascending length so each padded batch stays under max_batch_tokens
+    and no member is more than ~max_spread times the bucket's shortest (plus `slack`
+    tokens, so very short inputs aren't split into singletons).
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    buckets, cur, cur_max = [], [], 0
+    for i in order:
+        longest = max(cur_max, lengths[i])
+        if cur and (longest * (len(cur) + 1) > max_batch_tokens
+                    or lengths[i] > lengths[cur[0]] * max_spread + slack):
+            buckets.append(cur)
+            cur, longest = [], lengths[i]
+        cur.append(i)
+        cur_max = longest
+    if cur:
+        buckets.append(cur)
+    return buckets
+
+def _encode_for_indictrans(tokenizer, texts, src_flores, tgt_flores, preprocessed=False):
+    """Tokenize without padding; batches are padded per length bucket. preprocessed: IndicProcessor output (already tagged)."""
+    batch = list(texts)
+    if preprocessed:
+        return tokenizer(batch, truncation=True)
     try:
         if hasattr(tokenizer, "set_src_lang"):
             tokenizer.set_src_lang(src_flores)
@@ -144,54 +310,121 @@ def _encode_for_indictrans(tokenizer, text, src_flores, tgt_flores, model_name,
             tokenizer.set_tgt_lang(tgt_flores)
         else:
             tokenizer.tgt_lang = tgt_flores
-        enc = tokenizer(batch, return_tensors="pt", padding=True, truncation=True)
-        return {k: v.to(device) for k, v in enc.items()}
+        return tokenizer(batch, truncation=True)
     except TypeError:
-        tagged = [f"{src_flores} {text}"]
+        tagged = [f"{src_flores} {t}" for t in batch]
         try:
             tokenizer.tgt_lang = tgt_flores
         except Exception:
             pass
-        enc = tokenizer(tagged, return_tensors="pt", padding=True, truncation=True)
-        return {k: v.to(device) for k, v in enc.items()}
+        return tokenizer(tagged, truncation=True)
 
-def translate_with_indictrans2(text, src_flores, tgt_flores, use_processor: bool = False):
+def _pad_bucket(tokenizer, enc, idx):
+    # Multiples of 8 keep fp16 matmuls on tensor cores. Padding stays on the right:
+    # these are encoder inputs with position-indexed embeddings, so left padding would shift them.
+    padded = tokenizer.pad(
+        {k: [enc[k][i] for i in idx] for k in ("input_ids", "attention_mask")},
+        pad_to_multiple_of=8 if device == "cuda" else None,
+        return_tensors="pt",
+    )
+    return {k: v.to(device) for k, v in padded.items()}
+
+FALLBACK_BEAMS = 4
+HIGH_QUALITY_BEAMS = 5
+
+def _output_budget(batch, ceiling):
+    # generating to a fixed ceiling wastes steps on short inputs; outputs rarely exceed ~2x the source
+    return min(ceiling, int(batch["input_ids"].shape[1] * 2) + 20)
+
+def _indictrans_generate(model, tokenizer, batch, num_beams, with_scores=False):
+    with torch.inference_mode():
+        return model.generate(
+            **batch,
+            max_new_tokens=_output_budget(batch, 512),
+            num_beams=num_beams,
+            no_repeat_ngram_size=3,
+            repetition_penalty=2.0,
+            early_stopping=True,
+            pad_token_id=tokenizer.pad_token_id,
+            use_cache=False,
+            output_scores=with_scores,
+            return_dict_in_generate=with_scores,
+        )
+
+def _weak_greedy_rows(model, gen, batch, pad_token_id, min_logprob=-1.0, min_len_ratio=0.3):
+    """Rows whose greedy output has a low mean token logprob or is suspiciously short."""
+    scores = model.compute_transition_scores(gen.sequences, gen.scores, normalize_logits=True)
+    mask = gen.sequences[:, -scores.shape[1]:] != pad_token_id
+    lengths = mask.sum(dim=1).clamp(min=1)
+    mean_logprob = scores.masked_fill(~mask, 0.0).sum(dim=1) / lengths
+    len_ratio = lengths / batch["attention_mask"].sum(dim=1).clamp(min=1)
+    weak = (mean_logprob < min_logprob) | (len_ratio < min_len_ratio)
+    return weak.nonzero().flatten().tolist()
+
+def _indic_model_for(src_flores, tgt_flores):
     if src_flores == "eng_Latn" and tgt_flores in INDIC_LANGS:
-        model_name = EN_INDIC_MODEL
-    elif src_flores in INDIC_LANGS and tgt_flores == "eng_Latn":
-        model_name = INDIC_EN_MODEL
-    elif src_flores in INDIC_LANGS and tgt_flores in INDIC_LANGS:
-        model_name = INDIC_INDIC_MODEL
-    else:
-        raise ValueError("Invalid IndicTrans2 translation direction.")
+        return EN_INDIC_MODEL
+    if src_flores in INDIC_LANGS and tgt_flores == "eng_Latn":
+        return INDIC_EN_MODEL
+    if src_flores in INDIC_LANGS and tgt_flores in INDIC_LANGS:
+        return INDIC_INDIC_MODEL
+    raise ValueError("Invalid IndicTrans2 translation direction.")
 
+def translate_batch_indictrans2(chunks, src_flores, tgt_flores, max_batch_tokens: int = 4096, num_beams: int = 1):
+    """Translate a list of (<= ~1800 char) chunks; order is preserved, duplicates run once."""
+    model_name = _indic_model_for(src_flores, tgt_flores)
     tokenizer, model = _load_indic_model(model_name)
-    sentences = _split_into_sentences(text)
-    chunks = _group_sentences(sentences, char_limit=1800)
+    return _cached_translate(
+        ("indic", src_flores, tgt_flores, num_beams), list(chunks),
+        lambda todo: _translate_chunks_indictrans2(
+            tokenizer, model, model_name, todo, src_flores, tgt_flores, max_batch_tokens, num_beams
+        ),
+    )
 
-    outputs = []
-    ip = _get_indic_processor(model_name) if use_processor else _get_indic_processor(model_name)
-    for chunk in chunks:
+def translate_with_indictrans2(text, src_flores, tgt_flores, use_processor: bool = False, max_batch_tokens: int = 4096, num_beams: int = 1):
+    chunks = _group_sentences(_split_into_sentences(text), char_limit=1800)
+    return " ".join(translate_batch_indictrans2(chunks, src_flores, tgt_flores, max_batch_tokens, num_beams)).strip()
+
+def _translate_chunks_indictrans2(tokenizer, model, model_name, chunks, src_flores, tgt_flores, max_batch_tokens, num_beams):
+    decoded_all = [None] * len(chunks)
+    ip = _get_indic_processor(model_name)
+    texts = list(chunks)
+    if ip is not None:
+        texts = ip.preprocess_batch(texts, src_lang=src_flores, tgt_lang=tgt_flores)
+    try:
+        enc = _encode_for_indictrans(tokenizer, texts, src_flores, tgt_flores, preprocessed=ip is not None)
+        buckets = _bucket_by_length([len(ids) for ids in enc["input_ids"]], max_batch_tokens)
+    except Exception as e:
+        print(f"⚠️ IndicTrans2 encoding failed: {e}")
+        buckets = []
+
+    greedy = num_beams == 1
+    for idx in buckets:
         try:
-            enc = _encode_for_indictrans(tokenizer, chunk, src_flores, tgt_flores, model_name, device)
-            with torch.no_grad():
-                gen = model.generate(
-                    **enc,
-                    max_new_tokens=512,
-                    num_beams=4,
-                    no_repeat_ngram_size=3,
-                    repetition_penalty=2.0,
-                    early_stopping=True,
-                    use_cache=False,
-                )
-            decoded = tokenizer.batch_decode(gen, skip_special_tokens=True)
-            if ip is not None:
-                decoded = ip.postprocess_batch(decoded, lang=tgt_flores)
-            outputs.append(decoded[0] if decoded else "")
+            batch = _pad_bucket(tokenizer, enc, idx)
+            gen = _indictrans_generate(model, tokenizer, batch, num_beams, with_scores=greedy)
+            decoded = tokenizer.batch_decode(gen.sequences if greedy else gen, skip_special_tokens=True)
+            if greedy:
+                # re-run only the doubtful rows with beam search
+                weak = _weak_greedy_rows(model, gen, batch, tokenizer.pad_token_id)
+                if weak:
+                    sub = {k: v[weak] for k, v in batch.items()}
+                    redo = tokenizer.batch_decode(
+                        _indictrans_generate(model, tokenizer, sub, FALLBACK_BEAMS), skip_special_tokens=True
+                    )
+                    for r, out in zip(weak, redo):
+                        decoded[r] = out
+            for i, out in zip(idx, decoded):
+                decoded_all[i] = out
         except Exception as e:
-            print(f"⚠️ IndicTrans2 translation chunk failed: {e}")
-            outputs.append("[translation_error]")
-    return " ".join(outputs).strip()
+            print(f"⚠️ IndicTrans2 translation batch failed: {e}")
+
+    restored = [d if d is not None else "" for d in decoded_all]
+    if ip is not None:
+        # buckets run in length order; postprocess once in the original order so each
+        # sentence gets its own entity map, and failed rows still pop theirs
+        restored = ip.postprocess_batch(restored, lang=tgt_flores)
+    return [out if d is not None else "[translation_error]" for d, out in zip(decoded_all, restored)]
 
 # -----------------------------
 # NLLB Translation
@@ -217,36 +450,90 @@ def _get_forced_bos_token_id(tokenizer, tgt_flores_code):
         pass
     raise ValueError(f"Could not map target FLORES code '{tgt_flores_code}' to a token id.")
 
-def translate_with_nllb(text, src_flores, tgt_flores, max_new_tokens=1024):
+def _translate_batch_nllb_ct2(translator, texts, src_flores, tgt_flores, max_new_tokens, max_batch_tokens, num_beams):
+    tokenizer = _get_nllb_tokenizer()
+    tokenizer.src_lang = src_flores
+    enc = tokenizer(list(texts), truncation=True)
+    sources = [tokenizer.convert_ids_to_tokens(ids) for ids in enc["input_ids"]]
+    results = translator.translate_batch(
+        sources,
+        target_prefix=[[tgt_flores]] * len(sources),
+        beam_size=num_beams,
+        max_decoding_length=max_new_tokens,
+        max_batch_size=max_batch_tokens,
+        batch_type="tokens",
+        no_repeat_ngram_size=3,
+        repetition_penalty=2.0,
+    )
+    outputs = []
+    for r in results:
+        # drop the forced target-language token
+        ids = tokenizer.convert_tokens_to_ids(r.hypotheses[0][1:])
+        outputs.append(tokenizer.decode(ids, skip_special_tokens=True))
+    return outputs
+
+def translate_batch_nllb(texts, src_flores, tgt_flores, max_new_tokens=1024, max_batch_tokens=4096, num_beams=1):
+    """Translate a list of texts in length-bucketed batches; order is preserved, duplicates run once."""
+    return _cached_translate(
+        ("nllb", src_flores, tgt_flores, num_beams, max_new_tokens), list(texts),
+        lambda todo: _translate_batch_nllb(todo, src_flores, tgt_flores, max_new_tokens, max_batch_tokens, num_beams),
+    )
+
+def _translate_batch_nllb(texts, src_flores, tgt_flores, max_new_tokens, max_batch_tokens, num_beams):
+    translator = _load_nllb_ct2()
+    if translator is not None:
+        try:
+            return _translate_batch_nllb_ct2(translator, texts, src_flores, tgt_flores, max_new_tokens, max_batch_tokens, num_beams)
+        except Exception as e:
+            print(f"⚠️ CTranslate2 translation failed, using transformers: {e}")
+    nllb_tokenizer, nllb_model = _load_nllb_model()
     nllb_tokenizer.src_lang = src_flores
-    inputs = nllb_tokenizer(text, return_tensors="pt", truncation=True, padding="longest")
-    inputs = {k: v.to(device) for k, v in inputs.items()}
+    enc = nllb_tokenizer(list(texts), truncation=True)
     forced_bos_token_id = _get_forced_bos_token_id(nllb_tokenizer, tgt_flores)
-    with torch.no_grad():
-        gen = nllb_model.generate(
-            **inputs,
-            forced_bos_token_id=forced_bos_token_id,
-            max_new_tokens=max_new_tokens,
-            no_repeat_ngram_size=3,
-            repetition_penalty=2.0,
-            early_stopping=True,
-            num_beams=4,
-            use_cache=False,
-        )
-    return nllb_tokenizer.batch_decode(gen, skip_special_tokens=True)[0]
+    outputs = ["[translation_error]"] * len(texts)
+    for idx in _bucket_by_length([len(ids) for ids in enc["input_ids"]], max_batch_tokens):
+        try:
+            batch = _pad_bucket(nllb_tokenizer, enc, idx)
+            with torch.inference_mode():
+                gen = nllb_model.generate(
+                    **batch,
+                    forced_bos_token_id=forced_bos_token_id,
+                    max_new_tokens=_output_budget(batch, max_new_tokens),
+                    no_repeat_ngram_size=3,
+                    repetition_penalty=2.0,
+                    early_stopping=True,
+                    num_beams=num_beams,
+                    pad_token_id=nllb_tokenizer.pad_token_id,
+                    use_cache=False,
+                )
+            for i, out in zip(idx, nllb_tokenizer.batch_decode(gen, skip_special_tokens=True)):
+                outputs[i] = out
+        except Exception as e:
+            print(f"⚠️ Translation batch failed: {e}")
+    return outputs
+
+def warmup():
+    """Load NLLB (CT2 or transformers) and run a tiny generate so the first request doesn't pay for it."""
+    translate_batch_nllb(["Hello."], "eng_Latn", "hin_Deva", max_new_tokens=4)
+    if MT_COMPILE or MT_CUDAGRAPH:
+        # compiled NLLB: pay the compile for common input lengths (~16/32/64/128 tokens);
+        # distinct texts since the LRU would short-circuit a repeat. CUDA graphs are
+        # per-thread, so graphs are only captured for the calling thread: callers that
+        # translate from a worker thread (the server's nllb-batcher) must probe there too.
+        for n in (16, 32, 64, 128):
+            translate_batch_nllb([" ".join(["hello"] * (n - 2))], "eng_Latn", "hin_Deva", max_new_tokens=8)
+        # compiled IndicTrans2: trigger compilation / graph capture now. Two distinct
+        # inputs (the LRU would short-circuit a repeat) so the second call hits the compiled path.
+        for probe in ("Hello.", "How are you today?"):
+            translate_batch_indictrans2([probe], "eng_Latn", "hin_Deva")
 
-def translate_long_text(text, src_flores, tgt_flores):
+def translate_with_nllb(text, src_flores, tgt_flores, max_new_tokens=1024, num_beams=1):
+    return translate_batch_nllb([text], src_flores, tgt_flores, max_new_tokens=max_new_tokens, num_beams=num_beams)[0]
+
+def translate_long_text(text, src_flores, tgt_flores, num_beams=1):
     sentences = _split_into_sentences(text)
     chunks = _group_sentences(sentences)
-    outputs = []
-    for chunk in chunks:
-        try:
-            out = translate_with_nllb(chunk, src_flores, tgt_flores)
-            outputs.append(out)
-        except Exception as e:
-            print(f"⚠️ Translation chunk failed: {e}")
-            outputs.append("[translation_error]")
-    return " ".join(outputs).strip()
+    return " ".join(translate_batch_nllb(chunks, src_flores, tgt_flores, num_beams=num_beams)).strip()
 
 def translate_long_text_nllb(text, src_flores, tgt_flores):
     return translate_long_text(text, src_flores, tgt_flores)
@@ -257,10 +544,18 @@ def translate_long_text_nllb(text, src_flores, tgt_flores):
 try:
     from googletrans import Translator
     _HAS_GOOGLETRANS = True
-    _google_translator = Translator()
 except Exception:
+    Translator = None
     _HAS_GOOGLETRANS = False
-    _google_translator = None
+
+# created on first use so importing mt_model doesn't open an HTTP client
+_google_translator = None
+
+def _get_google_translator():
+    global _google_translator
+    if _google_translator is None:
+        _google_translator = Translator()
+    return _google_translator
 
 def translate_with_google(text: str, src_lang_iso_or_flores: str, tgt_lang_iso_or_flores: str) -> str:
     """
@@ -274,14 +569,12 @@ def translate_with_google(text: str, src_lang_iso_or_flores: str, tgt_lang_iso_o
     src_iso = src_lang_iso_or_flores
     tgt_iso = tgt_lang_iso_or_flores
     if "_" in src_iso:
-        inv_map = {v: k for k, v in ISO_TO_FLORES.items()}
-        src_iso = inv_map.get(src_iso, "auto")
+        src_iso = _FLORES_TO_ISO.get(src_iso, "auto")
     if "_" in tgt_iso:
-        inv_map = {v: k for k, v in ISO_TO_FLORES.items()}
-        tgt_iso = inv_map.get(tgt_iso, tgt_iso.split("_")[0])
+        tgt_iso = _FLORES_TO_ISO.get(tgt_iso, tgt_iso.split("_")[0])
 
     try:
-        result = _google_translator.translate(text, src=src_iso, dest=tgt_iso)
+        result = _get_google_translator().translate(text, src=src_iso, dest=tgt_iso)
         return result.text
     except Exception as e:
         print(f"⚠️ Google Translate failed: {e}")
@@ -290,35 +583,69 @@ def translate_with_google(text: str, src_lang_iso_or_flores: str, tgt_lang_iso_o
 # -----------------------------
 # Public API
 # -----------------------------
-def translate_text(text, src_lang_iso_or_flores, tgt_flores="eng_Latn", mt_model_choice: str = None, use_processor: bool = False):
-    if "_" in str(src_lang_iso_or_flores):
-        src_flores = src_lang_iso_or_flores
-    else:
-        iso = str(src_lang_iso_or_flores).lower()
-        src_flores = ISO_TO_FLORES.get(iso)
-        if src_flores is None:
-            raise ValueError(f"Unrecognized source language '{src_lang_iso_or_flores}'.")
-
-    if mt_model_choice is None:
-        choice = "auto"
-    else:
-        choice = str(mt_model_choice).strip().lower()
+def _to_src_flores(src_lang_iso_or_flores):
+    src_flores = to_flores(src_lang_iso_or_flores)
+    if src_flores is None:
+        raise ValueError(f"Unrecognized source language '{src_lang_iso_or_flores}'.")
+    return src_flores
 
+def _resolve_backend(src_flores, tgt_flores, mt_model_choice):
+    choice = "auto" if mt_model_choice is None else str(mt_model_choice).strip().lower()
     if choice in ("nllb", "meta-nllb"):
-        backend = "nllb"
-    elif choice in ("indic", "indictrans2", "ai4bharat"):
-        backend = "indic"
-    elif choice in ("google", "gt", "googletranslate"):
-        backend = "google"
-    else:
-        if src_flores in INDIC_LANGS or tgt_flores in INDIC_LANGS:
-            backend = "indic"
-        else:
-            backend = "nllb"
+        return "nllb"
+    if choice in ("indic", "indictrans2", "ai4bharat"):
+        return "indic"
+    if choice in ("google", "gt", "googletranslate"):
+        return "google"
+    if src_flores in INDIC_LANGS or tgt_flores in INDIC_LANGS:
+        return "indic"
+    return "nllb"
+
+def translate_batch(texts, src_lang_iso_or_flores, tgt_flores="eng_Latn", mt_model_choice: str = None, num_beams: int = 1):
+    """
+    Translate a list of texts (e.g. sentence-grouped chunks) with one pass over the
+    model: all items share the length-bucketed generate() batches. Order is preserved.
+    """
+    texts = list(texts)
+    src_flores = _to_src_flores(src_lang_iso_or_flores)
+    if src_flores == tgt_flores:
+        return texts
+    backend = _resolve_backend(src_flores, tgt_flores, mt_model_choice)
+    if backend == "indic":
+        return translate_batch_indictrans2(texts, src_flores, tgt_flores, num_beams=num_beams)
+    if backend == "google":
+        return [translate_with_google(t, src_lang_iso_or_flores, tgt_flores) for t in texts]
+    return translate_batch_nllb(texts, src_flores, tgt_flores, num_beams=num_beams)
+
+def translate_many(texts, src_lang_iso_or_flores, tgt_flores="eng_Latn", mt_model_choice: str = None, num_beams: int = 1):
+    """
+    Translate several independent (possibly long) texts with one translate_batch call:
+    each is split into sentence groups, all groups share the batches, results are rejoined.
+    """
+    texts = list(texts)
+    pieces, owners = [], []
+    for i, text in enumerate(texts):
+        chunks = _group_sentences(_split_into_sentences(text), char_limit=1800)
+        pieces.extend(chunks)
+        owners.extend([i] * len(chunks))
+    outs = translate_batch(pieces, src_lang_iso_or_flores, tgt_flores, mt_model_choice=mt_model_choice, num_beams=num_beams)
+    joined = [[] for _ in texts]
+    for i, out in zip(owners, outs):
+        joined[i].append(out)
+    return [" ".join(parts).strip() for parts in joined]
+
+def translate_text(text, src_lang_iso_or_flores, tgt_flores="eng_Latn", mt_model_choice: str = None, use_processor: bool = False, num_beams: int = 1, high_quality: bool = False):
+    """Greedy decoding by default; high_quality=True switches to 5-beam search."""
+    if high_quality:
+        num_beams = max(num_beams, HIGH_QUALITY_BEAMS)
+    src_flores = _to_src_flores(src_lang_iso_or_flores)
+    if src_flores == tgt_flores:
+        return text
 
+    backend = _resolve_backend(src_flores, tgt_flores, mt_model_choice)
     if backend == "indic":
-        return translate_with_indictrans2(text, src_flores, tgt_flores, use_processor=use_processor)
+        return translate_with_indictrans2(text, src_flores, tgt_flores, use_processor=use_processor, num_beams=num_beams)
     elif backend == "google":
         return translate_with_google(text, src_lang_iso_or_flores, tgt_flores)
     else:
-        return translate_long_text(text, src_flores, tgt_flores)
+        return translate_long_text(text, src_flores, tgt_flores, num_beams=num_beams)
@@ -81,17 +81,19 @@ _INDIC_RANGES = [
 ]
 
 
+# One character class over all ranges: the regex engine scans in C instead of
+# a Python loop over every (char, range) pair.
+_INDIC_CHAR_RE = re.compile("[" + "".join(f"\\u{lo:04X}-\\u{hi:04X}" for lo, hi in _INDIC_RANGES) + "]")
+_LATIN_CHAR_RE = re.compile(r"[A-Za-z]")
+_WS_SPLIT_RE = re.compile(r'(\s+)')
+
+
 def _contains_indic_char(s: str) -> bool:
-    for ch in s:
-        cp = ord(ch)
-        for lo, hi in _INDIC_RANGES:
-            if lo <= cp <= hi:
-                return True
-    return False
+    return _INDIC_CHAR_RE.search(s) is not None
 
 
 def _contains_latin(s: str) -> bool:
-    return bool(re.search(r"[A-Za-z]", s))
+    return _LATIN_CHAR_RE.search(s) is not None
 
 
 # -----------------------
@@ -248,7 +250,7 @@ def transliterate_text(text: str, src_iso: str, to_scheme: Optional[str] = "ITRA
 # Code-mixed handling helper
 # -----------------------
 def split_by_script_runs(text: str) -> List[Tuple[str, str]]:
-    parts = re.split(r'(\s+)', text)  # keep whitespace tokens
+    parts = _WS_SPLIT_RE.split(text)  # keep whitespace tokens
     runs = []
     for p in parts:
         if p.strip() == "":
@@ -0,0 +1,49 @@
+# MT_Model/sentence_split.py
+"""
+Sentence splitting shared by MT (IndicTrans2 / NLLB / Google) and TTS chunking.
+- Uses ICU's sentence BreakIterator when PyICU is installed (pip install PyICU).
+- Otherwise falls back to a single precompiled regex.
+Both break after . ? ! , the Devanagari danda (। ॥) and CJK full stops (。！？).
+"""
+
+import re
+import threading
+
+try:
+    from icu import BreakIterator, Locale
+except Exception:
+    BreakIterator = None
+
+# Latin/Indic terminators need following whitespace; CJK ones are not followed by a space
+_SENT_SPLIT_RE = re.compile(r"(?<=[.?!।॥])\s+|(?<=[。！？])\s*")
+
+
+# BreakIterator construction loads ICU's rule tables; build one per thread (instances aren't thread-safe)
+_icu_local = threading.local()
+
+
+def _split_icu(text: str):
+    bi = getattr(_icu_local, "bi", None)
+    if bi is None:
+        bi = _icu_local.bi = BreakIterator.createSentenceInstance(Locale.getRoot())
+    bi.setText(text)
+    out, start = [], bi.first()
+    for end in bi:
+        out.append(text[start:end])
+        start = end
+    return out
+
+
+def split_sentences(text: str):
+    """Split text into stripped, non-empty sentences; terminators stay attached."""
+    if not text:
+        return []
+    # ICU offsets are UTF-16 code units, which match str indices only inside the BMP
+    if BreakIterator is not None and max(text) <= "\uffff":
+        parts = _split_icu(text)
+    else:
+        parts = _SENT_SPLIT_RE.split(text)
+    return [p for p in map(str.strip, parts) if p]
+
+
+__all__ = ["split_sentences"]
@@ -5,11 +5,18 @@ import shutil
 
 CACHE_DIR_NAME = "tts_cache"
 
+# directories already created by this process; skips a makedirs syscall per lookup
+_MADE_DIRS = set()
+
+def ensure_dir(d):
+    if d not in _MADE_DIRS:
+        os.makedirs(d, exist_ok=True)
+        _MADE_DIRS.add(d)
+    return d
+
 def make_cache_dir(base_dir=None):
     base = base_dir or os.path.join(os.getcwd(), "TTS_Model")
-    cache_dir = os.path.join(base, CACHE_DIR_NAME)
-    os.makedirs(cache_dir, exist_ok=True)
-    return cache_dir
+    return ensure_dir(os.path.join(base, CACHE_DIR_NAME))
 
 def _hash_key(text: str, lang: str = "", desc: str = "", engine: str = "") -> str:
     key = (text or "") + "|" + (lang or "") + "|" + (desc or "") + "|" + (engine or "")
@@ -24,8 +31,11 @@ def cache_filepath(text: str, lang: str = "", desc: str = "", engine: str = "",
 
 def exists_in_cache(text: str, lang: str = "", desc: str = "", engine: str = "", base_dir=None, ext=".wav") -> str | None:
     path = cache_filepath(text, lang, desc, engine, base_dir=base_dir, ext=ext)
-    if os.path.exists(path) and os.path.getsize(path) > 100:
-        return path
+    try:
+        if os.stat(path).st_size > 100:
+            return path
+    except FileNotFoundError:
+        pass
     return None
 
 def save_to_cache(src_path: str, text: str, lang: str = "", desc: str = "", engine: str = "", base_dir=None, ext=None) -> str:
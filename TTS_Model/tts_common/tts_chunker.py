@@ -4,32 +4,39 @@ Utilities for splitting long text into safe chunks for TTS models.
 Uses nltk if available, otherwise simple heuristics.
 """
 
-import re
+from MT_Model.sentence_split import split_sentences
 
-# Try to use nltk sentence tokenizer if present
-try:
-    import nltk
-    nltk.data.find("tokenizers/punkt")
-except Exception:
-    try:
-        import nltk
-        nltk.download("punkt", quiet=True)
-    except Exception:
-        nltk = None  # we'll fallback
+# nltk is imported (and punkt fetched if missing) on the first split, not at import
+_nltk = None
+_nltk_checked = False
+
+def _get_nltk():
+    global _nltk, _nltk_checked
+    if not _nltk_checked:
+        _nltk_checked = True
+        try:
+            import nltk
+            try:
+                nltk.data.find("tokenizers/punkt")
+            except LookupError:
+                nltk.download("punkt", quiet=True)
+            _nltk = nltk
+        except Exception:
+            _nltk = None  # we'll fallback
+    return _nltk
 
 def sentence_split(text: str):
     text = text.strip()
     if not text:
         return []
+    nltk = _get_nltk()
     if nltk:
         try:
             return nltk.sent_tokenize(text)
         except Exception:
             pass
-    # simple fallback: split on .!? plus newlines
-    parts = re.split(r'(?<=[\.\?\!])\s+', text)
-    parts = [p.strip() for p in parts if p.strip()]
-    return parts
+    # fallback: shared ICU/regex splitter (handles । ॥ and CJK full stops too)
+    return split_sentences(text)
 
 def join_chunks(chunks):
     return " ".join([c.strip() for c in chunks if c.strip()])
@@ -43,17 +50,16 @@ def split_text_by_max_chars(text: str, max_chars: int = 700):
 
     sentences = sentence_split(text)
     chunks = []
-    current = ""
+    buf, length = [], 0
     for s in sentences:
-        if not current:
-            current = s
-        elif len(current) + 1 + len(s) <= max_chars:
-            current += " " + s
+        if buf and length + 1 + len(s) > max_chars:
+            chunks.append(" ".join(buf).strip())
+            buf, length = [s], len(s)
         else:
-            chunks.append(current.strip())
-            current = s
-    if current:
-        chunks.append(current.strip())
+            length += len(s) + (1 if buf else 0)
+            buf.append(s)
+    if buf:
+        chunks.append(" ".join(buf).strip())
 
     # final safety: ensure no chunk is longer than max_chars — if so, hard-split
     final = []
@@ -3,12 +3,11 @@
 Fallback TTS utilities: gTTS wrapper and placeholders for cloud TTS.
 """
 
+import io
 import os
 import tempfile
 
-def _ensure_dir(d):
-    os.makedirs(d, exist_ok=True)
-    return d
+from .tts_cache import ensure_dir as _ensure_dir
 
 def run_gtts(text: str, lang: str = "en", out_dir: str = "tts_output", out_name: str = "gtts_out.mp3", slow: bool = False):
     """
@@ -25,6 +24,19 @@ def run_gtts(text: str, lang: str = "en", out_dir: str = "tts_output", out_name:
     tts.save(out_path)
     return out_path
 
+def run_gtts_bytes(text: str, lang: str = "en", slow: bool = False) -> bytes:
+    """
+    Same as run_gtts but keeps the MP3 in memory. Returns the encoded bytes.
+    """
+    try:
+        from gtts import gTTS
+    except Exception as e:
+        raise RuntimeError("gTTS not installed. Install with `pip install gTTS`.") from e
+
+    buf = io.BytesIO()
+    gTTS(text=text, lang=lang, slow=slow).write_to_fp(buf)
+    return buf.getvalue()
+
 def convert_mp3_to_wav(mp3_path: str, wav_path: str, sample_rate: int = 22050):
     """
     Convert mp3 to wav using pydub if available; fallback to ffmpeg command if not.
@@ -42,6 +54,25 @@ def convert_mp3_to_wav(mp3_path: str, wav_path: str, sample_rate: int = 22050):
         subprocess.run(cmd, check=True)
         return wav_path
 
+def convert_mp3_to_array(mp3, sample_rate: int = 22050):
+    """
+    Decode mp3 (a path or the encoded bytes) straight to mono float32 samples (no intermediate WAV on disk).
+    Uses pydub if available; fallback to an ffmpeg pipe if not.
+    """
+    import numpy as np
+    in_memory = isinstance(mp3, (bytes, bytearray))
+    try:
+        from pydub import AudioSegment
+        src = io.BytesIO(mp3) if in_memory else mp3
+        seg = AudioSegment.from_file(src, format="mp3").set_frame_rate(sample_rate).set_channels(1).set_sample_width(2)
+        return np.frombuffer(seg.raw_data, dtype="<i2").astype(np.float32) / 32768.0
+    except Exception:
+        import subprocess
+        cmd = ["ffmpeg", "-i", "pipe:0" if in_memory else mp3, "-f", "f32le", "-ac", "1", "-ar", str(sample_rate), "-"]
+        feed = {"input": bytes(mp3)} if in_memory else {"stdin": subprocess.DEVNULL}
+        out = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True, **feed).stdout
+        return np.frombuffer(out, dtype=np.float32)
+
 # Placeholder for future cloud fallback (e.g., Google Cloud TTS, Azure)
 def run_cloud_tts_placeholder(text: str, lang: str = "en", out_dir: str = "tts_output", out_name: str = "cloud_out.wav"):
     """
@@ -12,26 +12,28 @@ This will:
 """
 
 import os
+import sys
+import time
 import shutil
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from .tts_cache import exists_in_cache, save_to_cache, cache_filepath, make_cache_dir
+from .tts_cache import exists_in_cache, save_to_cache, cache_filepath, make_cache_dir, ensure_dir
 from .tts_chunker import split_text_by_max_chars
-from .tts_fallbacks import run_gtts, convert_mp3_to_wav
-from .tts_interface import synthesize_indic_parler, synthesize_coqui_xtts
+from .tts_fallbacks import run_gtts_bytes, convert_mp3_to_array
+from .tts_interface import synthesize_indic_parler, synthesize_coqui_xtts, XTTS_STREAMS
 # optional mapping module (user may provide a more complete tts_utils)
 try:
     from TTS_Model.tts_common.tts_utils import FLORES_TO_ISO, INDIC_LANGS, XTTS_LANGS  # type: ignore
 except Exception:
     # minimal defaults
-    FLORES_TO_ISO = {
+    FLORES_TO_ISO = MappingProxyType({
         "eng_Latn": "en", "hin_Deva": "hi", "jpn_Jpan": "ja", "zho_Hans": "zh-cn"
-    }
-    INDIC_LANGS = {"hi", "bn", "gu", "mr", "ta", "te", "kn", "ml", "pa", "or", "as", "ne"}
-    XTTS_LANGS = {"en", "es", "fr", "de", "it", "pt", "ja", "ko", "zh-cn", "hi"}
+    })
+    INDIC_LANGS = frozenset({"hi", "bn", "gu", "mr", "ta", "te", "kn", "ml", "pa", "or", "as", "ne"})
+    XTTS_LANGS = frozenset({"en", "es", "fr", "de", "it", "pt", "ja", "ko", "zh-cn", "hi"})
 
-def _normalize_lang(code: str) -> str:
-    if not code:
-        return ""
+def _reduce_lang(code: str) -> str:
     # handle Flores-style codes or iso
     if code in FLORES_TO_ISO:
         # Flores -> ISO (or mapping value could be iso-like)
@@ -45,33 +47,104 @@ def _normalize_lang(code: str) -> str:
         return code.split("_")[0]
     return code
 
+def _auto_engine(lang: str) -> str:
+    # auto heuristic: indic languages -> indic parler; everything else tries xtts first
+    # (then indic, then gtts via the fallback chain)
+    return "indic" if lang in INDIC_LANGS else "xtts"
+
+# every known FLORES / ISO code -> (normalized code, auto engine), built once
+_LANG_TABLE = MappingProxyType({
+    sys.intern(code): (sys.intern(_reduce_lang(code)), _auto_engine(_reduce_lang(code)))
+    for code in (*FLORES_TO_ISO.keys(), *FLORES_TO_ISO.values(), *INDIC_LANGS, *XTTS_LANGS)
+})
+
+def _lang_info(code: str):
+    """(normalized code, auto engine) with one dict lookup for known codes."""
+    if not code:
+        return "", "xtts"
+    hit = _LANG_TABLE.get(code)
+    if hit is not None:
+        return hit
+    lang = _reduce_lang(code)
+    return lang, _auto_engine(lang)
+
+GTTS_SAMPLE_RATE = 22050
+GTTS_WORKERS = int(os.getenv("VASHA_GTTS_WORKERS", "8"))
+
+def _gtts_part(chunk, lang, out_dir, mp3_name, retries=2):
+    """gTTS one chunk and decode the mp3 in memory: returns (array, sr), or an mp3 path if decoding fails."""
+    for attempt in range(retries + 1):
+        try:
+            mp3_bytes = run_gtts_bytes(chunk, lang=lang or "en")
+            break
+        except RuntimeError:
+            raise  # gTTS not installed
+        except Exception:
+            # network errors / 429s: back off and retry
+            if attempt == retries:
+                raise
+            time.sleep(1.0 * (2 ** attempt))
+    try:
+        return (convert_mp3_to_array(mp3_bytes, GTTS_SAMPLE_RATE), GTTS_SAMPLE_RATE)
+    except Exception:
+        mp3_path = os.path.join(out_dir, mp3_name)
+        with open(mp3_path, "wb") as f:
+            f.write(mp3_bytes)
+        return mp3_path
+
+# raised-cosine crossfade (ms) between consecutive TTS parts; 0 disables
+TTS_XFADE_MS = float(os.getenv("VASHA_TTS_XFADE_MS", "10"))
+
 def _assemble_wav_parts(parts, out_path, sample_rate=24000):
     """
-    Concatenate audio parts (file paths or numpy arrays) into single WAV
-    parts: list of file paths. For simplicity we expect file paths.
+    Concatenate audio parts into single WAV, streaming each part to disk as it is read
+    so peak memory is one part rather than the whole output. Consecutive parts are joined
+    with a short cosine crossfade to avoid clicks at chunk boundaries.
+    parts: file paths, (wav_path, sr) tuples or (numpy_array, sr) tuples.
     """
     import soundfile as sf
     import numpy as np
 
-    all_audio = []
-    sr = None
-    for p in parts:
-        if isinstance(p, (list, tuple)):
-            # maybe (wav_path, sr)
-            p, src = p if len(p) > 1 else (p[0], None)
-        if not os.path.exists(p):
-            continue
-        data, s = sf.read(p)
-        if sr is None:
-            sr = s
-        # resample? we will assume same sr or rely on model defaults
-        all_audio.append(data)
-    if not all_audio:
+    out = None
+    tail = None  # last `xfade` samples, held back to blend with the next part
+    try:
+        for p in parts:
+            data = None
+            if isinstance(p, (list, tuple)):
+                if len(p) > 1 and isinstance(p[0], np.ndarray):
+                    # already decoded samples
+                    data, s = p[0], p[1]
+                else:
+                    # maybe (wav_path, sr)
+                    p = p[0]
+            if data is None:
+                if not os.path.exists(p):
+                    continue
+                data, s = sf.read(p, dtype="float32")
+            data = np.asarray(data, dtype=np.float32)
+            if out is None:
+                # resample? we will assume same sr or rely on model defaults
+                channels = 1 if data.ndim == 1 else data.shape[1]
+                out = sf.SoundFile(out_path, "w", samplerate=int(s or sample_rate), channels=channels)
+                xfade = int(out.samplerate * TTS_XFADE_MS / 1000)
+            if tail is not None:
+                k = min(len(tail), len(data))
+                w = (0.5 * (1 - np.cos(np.linspace(0, np.pi, k, dtype=np.float32)))).reshape((-1,) + (1,) * (data.ndim - 1))
+                out.write(tail[:len(tail) - k])
+                out.write(tail[len(tail) - k:] * (1 - w) + data[:k] * w)
+                data = data[k:]
+            if xfade:
+                tail = data[max(0, len(data) - xfade):]
+                data = data[:len(data) - len(tail)]
+            out.write(data)
+        if tail is not None:
+            out.write(tail)
+    finally:
+        if out is not None:
+            out.close()
+    if out is None:
         raise RuntimeError("No audio parts to assemble.")
-    concat = np.concatenate(all_audio)
-    dst_sr = int(sr or sample_rate)
-    sf.write(out_path, concat, dst_sr)
-    return out_path, dst_sr
+    return out_path, out.samplerate
 
 def run_universal_tts(
     text: str,
@@ -91,12 +164,12 @@ def run_universal_tts(
     """
 
     out_dir = out_dir or os.path.join(os.getcwd(), "tts_output")
-    os.makedirs(out_dir, exist_ok=True)
+    ensure_dir(out_dir)
     out_name = out_name or "tts_out.wav"
     out_path = os.path.join(out_dir, out_name)
 
     # 1) normalize language
-    lang_norm = _normalize_lang(target_lang)
+    lang_norm, auto_engine = _lang_info(target_lang)
 
     # Auto-detect default speaker for XTTS if none provided
     if not reference_audio:
@@ -116,24 +189,18 @@ def run_universal_tts(
     if prefer and prefer != "auto":
         engine = prefer.lower()
     else:
-        # auto heuristic: indic languages -> indic parler; XTTS supported -> xtts else gtts
-        if lang_norm in INDIC_LANGS:
-            engine = "indic"
-        elif lang_norm in XTTS_LANGS:
-            engine = "xtts"
-        else:
-            # default try xtts first for global, then indic, then gtts
-            engine = "xtts"
+        engine = auto_engine
 
     # 3) check cache
     # Include speaker reference in cache key for XTTS so different voices don't collide
     desc_for_cache = ""
-    if engine in ("xtts", "coqui", "coqui_xtts") and reference_audio and os.path.exists(reference_audio):
+    if engine in ("xtts", "coqui", "coqui_xtts") and reference_audio:
         try:
+            # one stat doubles as the existence check
             st = os.stat(reference_audio)
             desc_for_cache = f"speaker_wav={os.path.basename(reference_audio)}|{st.st_size}|{int(st.st_mtime)}"
-        except Exception:
-            desc_for_cache = f"speaker_wav={os.path.basename(reference_audio)}"
+        except OSError:
+            pass
 
     if use_cache:
         cached = exists_in_cache(text, lang_norm, desc=desc_for_cache, engine=engine, base_dir=None, ext=".wav")
@@ -148,89 +215,103 @@ def run_universal_tts(
         raise ValueError("Empty text passed to TTS.")
 
     part_paths = []
+    if engine not in ("indic", "xtts", "coqui", "coqui_xtts"):
+        # gTTS is network-bound: fetch all chunks concurrently, order preserved
+        # repeated chunks are fetched once
+        unique = list(dict.fromkeys(chunks))
+        with ThreadPoolExecutor(max_workers=max(1, min(GTTS_WORKERS, len(unique)))) as pool:
+            fetched = dict(zip(unique, pool.map(
+                lambda item: _gtts_part(item[1], lang_norm, out_dir, f"gtts_part_{item[0]:03d}.mp3"),
+                enumerate(unique),
+            )))
+        part_paths = [fetched[c] for c in chunks]
+        chunks = []  # nothing left for the per-chunk model loop below
+    # chunk text -> finished part, so repeated chunks (greetings, headers) are synthesized once
+    done_parts = {}
+    first_idx = {}
     for idx, chunk in enumerate(chunks):
-        tmp_name = f"part_{idx:03d}.wav"
-        tmp_path = os.path.join(out_dir, tmp_name)
-        try:
-            if engine == "indic":
-                # Indic-Parler uses description voice prompts; best-effort default
-                desc = "The speaker speaks naturally with clear audio and neutral tone."
-                p_out, sr = synthesize_indic_parler(chunk, description=desc, out_path=tmp_path, hf_token=hf_token, device=device)
-                part_paths.append(p_out)
-            elif engine in ("xtts", "coqui", "coqui_xtts"):
-                # Coqui XTTS - pass reference if given for cloning
-                p_out, sr = synthesize_coqui_xtts(chunk, language=lang_norm, speaker_wav=reference_audio, out_path=tmp_path, device=device)
-                part_paths.append(p_out)
-            else:
-                # fallback to gTTS
-                mp3_name = f"gtts_part_{idx:03d}.mp3"
-                mp3_path = run_gtts(chunk, lang=lang_norm or "en", out_dir=out_dir, out_name=mp3_name)
-                wav_tmp = os.path.join(out_dir, tmp_name)
-                try:
-                    convert_mp3_to_wav(mp3_path, wav_tmp)
-                    part_paths.append(wav_tmp)
-                except Exception:
-                    # if conversion fails, return mp3
-                    part_paths.append(mp3_path)
-        except Exception as e:
-            # Log the actual error for debugging
-            import traceback
-            error_msg = f"[ERROR] TTS synthesis failed for chunk {idx} with {engine}: {str(e)}"
-            print(error_msg)
-            print(f"[DEBUG] Full traceback:\n{traceback.format_exc()}")
+        first_idx.setdefault(chunk, idx)
+    xtts_jobs, xtts_pool = {}, None
+    if engine in ("xtts", "coqui", "coqui_xtts") and XTTS_STREAMS > 1 and len(first_idx) > 1:
+        # results are collected in order below, so failures still go through the fallback chain
+        xtts_pool = ThreadPoolExecutor(max_workers=XTTS_STREAMS)
+        xtts_jobs = {
+            idx: xtts_pool.submit(synthesize_coqui_xtts, chunk, language=lang_norm, speaker_wav=reference_audio,
+                                  out_path=os.path.join(out_dir, f"part_{idx:03d}.wav"), device=device)
+            for chunk, idx in first_idx.items()
+        }
+    try:
+        for idx, chunk in enumerate(chunks):
+            if chunk in done_parts:
+                part_paths.append(done_parts[chunk])
+                continue
+            tmp_name = f"part_{idx:03d}.wav"
+            tmp_path = os.path.join(out_dir, tmp_name)
+            try:
+                if engine == "indic":
+                    # Indic-Parler uses description voice prompts; best-effort default
+                    desc = "The speaker speaks naturally with clear audio and neutral tone."
+                    p_out, sr = synthesize_indic_parler(chunk, description=desc, out_path=tmp_path, hf_token=hf_token, device=device)
+                    part_paths.append(p_out)
+                elif engine in ("xtts", "coqui", "coqui_xtts"):
+                    # Coqui XTTS - pass reference if given for cloning
+                    if idx in xtts_jobs:
+                        p_out, sr = xtts_jobs[idx].result()
+                    else:
+                        p_out, sr = synthesize_coqui_xtts(chunk, language=lang_norm, speaker_wav=reference_audio, out_path=tmp_path, device=device)
+                    part_paths.append(p_out)
+                else:
+                    # fallback to gTTS
+                    part_paths.append(_gtts_part(chunk, lang_norm, out_dir, f"gtts_part_{idx:03d}.mp3"))
+                done_parts[chunk] = part_paths[-1]
+            except Exception as e:
+                # Log the actual error for debugging
+                import traceback
+                error_msg = f"[ERROR] TTS synthesis failed for chunk {idx} with {engine}: {str(e)}"
+                print(error_msg)
+                print(f"[DEBUG] Full traceback:\n{traceback.format_exc()}")
             
-            # If user explicitly chose Indic-Parler and it fails, fall back to gTTS so we still return audio.
-            if explicit_engine and engine == "indic":
-                print(f"[WARN] IndicParler-TTS failed, falling back to gTTS for chunk {idx}")
-                try:
-                    mp3_name = f"gtts_fallback_part_{idx:03d}.mp3"
-                    mp3_path = run_gtts(chunk, lang=lang_norm or "en", out_dir=out_dir, out_name=mp3_name)
-                    wav_tmp = os.path.join(out_dir, tmp_name)
+                # If user explicitly chose Indic-Parler and it fails, fall back to gTTS so we still return audio.
+                if explicit_engine and engine == "indic":
+                    print(f"[WARN] IndicParler-TTS failed, falling back to gTTS for chunk {idx}")
                     try:
-                        convert_mp3_to_wav(mp3_path, wav_tmp)
-                        part_paths.append(wav_tmp)
+                        part_paths.append(_gtts_part(chunk, lang_norm, out_dir, f"gtts_fallback_part_{idx:03d}.mp3"))
+                        continue
                     except Exception:
-                        part_paths.append(mp3_path)
-                    continue
-                except Exception:
-                    # If even the final fallback fails, re-raise to surface the error.
+                        # If even the final fallback fails, re-raise to surface the error.
+                        raise
+                # When user explicitly chose another engine, do NOT fall back to others (no XTTS/Indic/gTTS chain).
+                if explicit_engine:
                     raise
-            # When user explicitly chose another engine, do NOT fall back to others (no XTTS/Indic/gTTS chain).
-            if explicit_engine:
-                raise
-            # If primary engine was "auto" and it fails, try fallback order: xtts -> indic -> gtts
-            fallback_used = None
-            last_exc = e
-            try:
-                if engine != "xtts":
-                    p_out, sr = synthesize_coqui_xtts(chunk, language=lang_norm, speaker_wav=reference_audio, out_path=tmp_path, device=device)
-                    part_paths.append(p_out)
-                    fallback_used = "xtts"
-                else:
-                    raise RuntimeError("Primary xtts failed and fallback not attempted.")
-            except Exception as e2:
-                last_exc = e2
+                # If primary engine was "auto" and it fails, try fallback order: xtts -> indic -> gtts
+                fallback_used = None
+                last_exc = e
                 try:
-                    if engine != "indic":
-                        p_out, sr = synthesize_indic_parler(chunk, description="The speaker speaks naturally.", out_path=tmp_path, hf_token=hf_token, device=device)
+                    if engine != "xtts":
+                        p_out, sr = synthesize_coqui_xtts(chunk, language=lang_norm, speaker_wav=reference_audio, out_path=tmp_path, device=device)
                         part_paths.append(p_out)
-                        fallback_used = "indic"
+                        fallback_used = "xtts"
                     else:
-                        raise RuntimeError("Indic fallback failed too.")
-                except Exception as e3:
-                    last_exc = e3
-                    # final fallback to gTTS
-                    mp3_name = f"gtts_fallback_part_{idx:03d}.mp3"
-                    mp3_path = run_gtts(chunk, lang=lang_norm or "en", out_dir=out_dir, out_name=mp3_name)
-                    wav_tmp = os.path.join(out_dir, tmp_name)
+                        raise RuntimeError("Primary xtts failed and fallback not attempted.")
+                except Exception as e2:
+                    last_exc = e2
                     try:
-                        convert_mp3_to_wav(mp3_path, wav_tmp)
-                        part_paths.append(wav_tmp)
-                        fallback_used = "gtts"
-                    except Exception:
-                        part_paths.append(mp3_path)
-                        fallback_used = "gtts_mp3"
-            # continue after fallback
+                        if engine != "indic":
+                            p_out, sr = synthesize_indic_parler(chunk, description="The speaker speaks naturally.", out_path=tmp_path, hf_token=hf_token, device=device)
+                            part_paths.append(p_out)
+                            fallback_used = "indic"
+                        else:
+                            raise RuntimeError("Indic fallback failed too.")
+                    except Exception as e3:
+                        last_exc = e3
+                        # final fallback to gTTS
+                        part = _gtts_part(chunk, lang_norm, out_dir, f"gtts_fallback_part_{idx:03d}.mp3")
+                        part_paths.append(part)
+                        fallback_used = "gtts" if isinstance(part, tuple) else "gtts_mp3"
+                # continue after fallback
+    finally:
+        if xtts_pool is not None:
+            xtts_pool.shutdown(wait=True, cancel_futures=True)
 
     # 5) assemble
     final_path, final_sr = _assemble_wav_parts(part_paths, out_path)
@@ -8,6 +8,8 @@ These functions return a path to the generated audio file (wav) and sampling rat
 """
 
 import os
+import contextlib
+import threading
 import numpy as np
 import soundfile as sf
 from typing import Optional
@@ -15,6 +17,26 @@ from typing import Optional
 # Model singletons to avoid reloading
 _INDIC_TTS_INSTANCE = None
 _COQUI_TTS_INSTANCE = None
+_COQUI_LOCK = threading.Lock()
+
+# VASHA_XTTS_STREAMS > 1: prepare and write that many XTTS chunks concurrently.
+# The XTTS singleton keeps mutable GPT inference state (prefix-embedding cache),
+# so the model calls themselves are serialized by _XTTS_INFER_LOCK.
+XTTS_STREAMS = max(1, int(os.getenv("VASHA_XTTS_STREAMS", "1")))
+_XTTS_INFER_LOCK = threading.Lock()
+
+# VASHA_XTTS_DTYPE: bf16 | fp16 | fp32 on CUDA (default fp16; bf16 is opt-in)
+XTTS_DTYPE = os.getenv("VASHA_XTTS_DTYPE", "").strip().lower()
+
+# Opt-in (VASHA_XTTS_COMPILE=1): torch.compile the XTTS GPT per-token decode step
+XTTS_COMPILE = os.getenv("VASHA_XTTS_COMPILE", "0") == "1"
+
+def _xtts_cuda_dtype():
+    import torch
+    name = XTTS_DTYPE or "fp16"
+    if name == "bf16" and not torch.cuda.is_bf16_supported():
+        name = "fp16"
+    return {"bf16": torch.bfloat16, "fp16": torch.float16}.get(name)
 
 # Provide lazy import so package doesn't fail when model dependencies missing
 def _get_indic_instance(hf_token: Optional[str] = None, device: Optional[str] = None):
@@ -42,6 +64,15 @@ def _get_coqui_instance(model_name="tts_models/multilingual/multi-dataset/xtts_v
     Return a Coqui TTS instance (TTS api). Keep as singleton.
     Fixes PyTorch 2.6+ compatibility issue with weights_only parameter.
     """
+    global _COQUI_TTS_INSTANCE
+    if _COQUI_TTS_INSTANCE is not None:
+        return _COQUI_TTS_INSTANCE
+    with _COQUI_LOCK:
+        if _COQUI_TTS_INSTANCE is None:
+            _load_coqui_instance(model_name, device)
+    return _COQUI_TTS_INSTANCE
+
+def _load_coqui_instance(model_name, device):
     global _COQUI_TTS_INSTANCE
     if _COQUI_TTS_INSTANCE is None:
         # Fix for PyTorch 2.6+: Patch TTS library's load_fsspec to use weights_only=False
@@ -113,8 +144,102 @@ def _get_coqui_instance(model_name="tts_models/multilingual/multi-dataset/xtts_v
             _COQUI_TTS_INSTANCE.to(device if device else ("cuda" if __import__("torch").cuda.is_available() else "cpu"))
         except Exception:
             pass
+        _cast_xtts_gpt(_COQUI_TTS_INSTANCE, device)
+        _fp32_xtts_vocoder(_COQUI_TTS_INSTANCE)
+        _maybe_compile_xtts(_COQUI_TTS_INSTANCE)
     return _COQUI_TTS_INSTANCE
 
+def _cast_xtts_gpt(inst, device=None):
+    """Store the XTTS GPT in BF16 on CUDA; the HiFi-GAN vocoder stays FP32."""
+    import torch
+    if not torch.cuda.is_available() or (device or "").startswith("cpu") or _xtts_cuda_dtype() is not torch.bfloat16:
+        return
+    gpt = getattr(getattr(getattr(inst, "synthesizer", None), "tts_model", None), "gpt", None)
+    if gpt is not None:
+        gpt.to(torch.bfloat16)
+        print("[INFO] XTTS GPT weights cast to bfloat16")
+
+def _fp32_xtts_vocoder(inst):
+    """
+    Run the HiFi-GAN vocoder in FP32 outside autocast: Xtts.inference calls .numpy()
+    on its waveform, which fails for bf16, and FP32 is cheap next to the GPT decode.
+    """
+    import torch
+    model = getattr(getattr(inst, "synthesizer", None), "tts_model", None)
+    decoder = getattr(model, "hifigan_decoder", None)
+    if decoder is None or getattr(decoder, "_vasha_fp32", False):
+        return
+    forward = decoder.forward
+
+    def fp32_forward(*args, **kwargs):
+        args = [a.float() if torch.is_tensor(a) else a for a in args]
+        kwargs = {k: v.float() if torch.is_tensor(v) else v for k, v in kwargs.items()}
+        with torch.autocast(device_type="cuda", enabled=False):
+            return forward(*args, **kwargs)
+
+    decoder.forward = fp32_forward
+    decoder._vasha_fp32 = True
+
+def _maybe_compile_xtts(inst):
+    import torch
+    if not XTTS_COMPILE or not hasattr(torch, "compile"):
+        return
+    gpt = getattr(getattr(getattr(inst, "synthesizer", None), "tts_model", None), "gpt", None)
+    step = getattr(gpt, "gpt_inference", None)
+    if step is None:
+        return
+    try:
+        # only the decode step: generate() stays eager. XTTS keeps a tuple KV cache that grows
+        # every token, so no static cache / CUDA graphs; dynamic=True avoids per-length recompiles.
+        step.forward = torch.compile(step.forward, fullgraph=False, dynamic=True)
+        print("[INFO] torch.compile enabled for XTTS GPT decode step")
+    except Exception as e:
+        print(f"[WARN] torch.compile unavailable for XTTS: {e}")
+
+def _xtts_inference(device: Optional[str] = None):
+    """
+    Exclusive use of the shared XTTS model, inference_mode, plus BF16/FP16 autocast
+    (VASHA_XTTS_DTYPE) when XTTS runs on CUDA.
+    """
+    import torch
+    stack = contextlib.ExitStack()
+    stack.enter_context(_XTTS_INFER_LOCK)
+    stack.enter_context(torch.inference_mode())
+    on_cuda = torch.cuda.is_available() and not (device or "").startswith("cpu")
+    if on_cuda:
+        dtype = _xtts_cuda_dtype()
+        if dtype is not None:
+            stack.enter_context(torch.autocast(device_type="cuda", dtype=dtype))
+    return stack
+
+# Speaker conditioning (GPT latents + speaker embedding) keyed by reference file identity
+_XTTS_LATENTS = {}
+_XTTS_LATENTS_LOCK = threading.Lock()
+
+def _xtts_speaker_latents(model, speaker_wav):
+    st = os.stat(speaker_wav)
+    key = (os.path.abspath(speaker_wav), st.st_size, int(st.st_mtime))
+    with _XTTS_LATENTS_LOCK:
+        if key not in _XTTS_LATENTS:
+            _XTTS_LATENTS[key] = model.get_conditioning_latents(audio_path=[speaker_wav])
+        return _XTTS_LATENTS[key]
+
+def _synthesize_xtts_direct(tts, text, language, speaker_wav, out_path, device=None):
+    """
+    Call Xtts.inference with cached speaker latents, so the reference audio is encoded
+    once per voice instead of once per chunk. Returns None when the model isn't XTTS.
+    """
+    model = getattr(getattr(tts, "synthesizer", None), "tts_model", None)
+    if model is None or not hasattr(model, "get_conditioning_latents") or not hasattr(model, "inference"):
+        return None
+    with _xtts_inference(device):
+        gpt_cond_latent, speaker_embedding = _xtts_speaker_latents(model, speaker_wav)
+        out = model.inference(text, language, gpt_cond_latent, speaker_embedding, enable_text_splitting=True)
+    arr = np.asarray(out["wav"], dtype=np.float32)
+    sr = int(getattr(getattr(model.config, "audio", None), "output_sample_rate", 24000))
+    sf.write(out_path, arr.reshape(-1), sr)
+    return out_path, sr
+
 def synthesize_coqui_xtts(text: str, language: str = "en", speaker_wav: Optional[str] = None,
                           out_path: str = "out_xtts.wav", model_name="tts_models/multilingual/multi-dataset/xtts_v2",
                           device: Optional[str] = None, speaker: Optional[str] = None):
@@ -136,19 +261,33 @@ def synthesize_coqui_xtts(text: str, language: str = "en", speaker_wav: Optional
         )
     if not os.path.exists(speaker_wav):
         raise ValueError(f"XTTS speaker_wav not found: {speaker_wav}")
+    try:
+        info = sf.info(speaker_wav)
+        if info.frames <= 0 or info.samplerate <= 0:
+            raise ValueError(f"XTTS speaker_wav is empty: {speaker_wav}")
+    except RuntimeError:
+        pass  # format libsndfile can't parse; XTTS loads it through torchaudio
+
+    try:
+        res = _synthesize_xtts_direct(tts, text, language, speaker_wav, out_path, device=device)
+        if res is not None:
+            return res
+    except Exception as e:
+        print(f"[WARN] XTTS direct inference failed, using TTS API: {e}")
 
     # Prefer tts_to_file
     if hasattr(tts, "tts_to_file"):
         try:
-            tts.tts_to_file(
-                text=text,
-                speaker_wav=speaker_wav,
-                language=language,
-                file_path=out_path,
-            )
+            with _xtts_inference(device):
+                tts.tts_to_file(
+                    text=text,
+                    speaker_wav=speaker_wav,
+                    language=language,
+                    file_path=out_path,
+                )
             try:
-                data, sr = sf.read(out_path)
-                return out_path, sr
+                # header only; no need to decode the whole file for its rate
+                return out_path, sf.info(out_path).samplerate
             except Exception:
                 return out_path, 24000
         except Exception as e:
@@ -156,7 +295,8 @@ def synthesize_coqui_xtts(text: str, language: str = "en", speaker_wav: Optional
 
     # Fallback: array-returning API
     try:
-        wav = tts.tts(text=text, speaker_wav=speaker_wav, language=language)
+        with _xtts_inference(device):
+            wav = tts.tts(text=text, speaker_wav=speaker_wav, language=language)
         sr = 24000
         if isinstance(wav, tuple) and len(wav) >= 2:
             arr, sr = wav[0], int(wav[1])
@@ -2,13 +2,13 @@
 # tts_common/tts_utils.py
 # =========================================================
 
-import re
-from transformers import AutoTokenizer
+from types import MappingProxyType
+from MT_Model.sentence_split import split_sentences
 
 # ---------------------------------------------------------
-# 🌍 FLORES → ISO Mapping
+# 🌍 FLORES → ISO Mapping (TTS engine codes, e.g. zh-cn for XTTS)
 # ---------------------------------------------------------
-FLORES_TO_ISO = {
+FLORES_TO_ISO = MappingProxyType({
     "eng_Latn": "en", "spa_Latn": "es", "fra_Latn": "fr", "deu_Latn": "de",
     "ita_Latn": "it", "por_Latn": "pt", "rus_Cyrl": "ru", "tur_Latn": "tr",
     "ara_Arab": "ar", "zho_Hans": "zh-cn", "jpn_Jpan": "ja", "kor_Hang": "ko",
@@ -16,64 +16,89 @@ FLORES_TO_ISO = {
     "pan_Guru": "pa", "asm_Beng": "as", "ory_Orya": "or", "npi_Deva": "ne",
     "tam_Taml": "ta", "tel_Telu": "te", "kan_Knda": "kn", "mal_Mlym": "ml",
     "urd_Arab": "ur"
-}
+})
 
 # ---------------------------------------------------------
 # 🌐 Supported TTS Languages
 # ---------------------------------------------------------
-XTTS_LANGS = {
+XTTS_LANGS = frozenset({
     "en", "es", "fr", "de", "it", "pt", "pl", "tr", "ru", "nl",
     "cs", "ar", "zh-cn", "hu", "ko", "ja", "hi"
-}
+})
 
-INDIC_LANGS = {
+INDIC_LANGS = frozenset({
     "hi", "bn", "gu", "ta", "te", "kn", "ml", "mr", "pa", "as", "or", "ne", "ur"
-}
+})
 
 # ---------------------------------------------------------
 # 🪶 Tokenizer & Text Splitters
 # ---------------------------------------------------------
-_xtts_tokenizer = AutoTokenizer.from_pretrained("facebook/mbart-large-50")
+def _token_counter(lang="en"):
+    """
+    Token count under XTTS's own BPE when the XTTS model is already loaded;
+    otherwise ~4 characters per token. Never loads a tokenizer by itself.
+    """
+    try:
+        from TTS_Model.tts_common import tts_interface
+        tok = tts_interface._COQUI_TTS_INSTANCE.synthesizer.tts_model.tokenizer
+    except Exception:
+        tok = None
+
+    def count(s):
+        if tok is not None:
+            try:
+                return len(tok.encode(s, lang))
+            except Exception:
+                pass
+        return (len(s) + 3) // 4
+    return count
 
 
-def split_text_by_tokens(text, max_tokens=350):
-    """Split text safely based on XTTS tokenizer length."""
+def split_text_by_tokens(text, max_tokens=350, lang="en"):
+    """Split text safely based on XTTS tokenizer length, packing whole sentences per chunk."""
     text = text.strip()
     if not text:
         return []
 
-    tokens = _xtts_tokenizer.encode(text)
-    total = len(tokens)
-    if total <= max_tokens:
+    count = _token_counter(lang)
+    if count(text) <= max_tokens:
         return [text]
 
-    chunks, start = [], 0
-    while start < total:
-        end = min(start + max_tokens, total)
-        sub_text = _xtts_tokenizer.decode(tokens[start:end])
-        chunks.append(sub_text.strip())
-        start = end
-    return chunks
+    chunks, buf, used = [], [], 0
+    for s in split_sentences(text):
+        n = count(s)
+        if buf and used + n > max_tokens:
+            chunks.append(" ".join(buf))
+            buf, used = [], 0
+        if n > max_tokens:
+            # a single over-long sentence: cut it by characters in proportion
+            step = max(1, len(s) * max_tokens // n)
+            chunks.extend(s[i:i + step].strip() for i in range(0, len(s), step))
+            continue
+        buf.append(s)
+        used += n
+    if buf:
+        chunks.append(" ".join(buf))
+    return [c for c in chunks if c]
 
 
 def smart_split_text(text, lang="en", max_len=120):
     """Language-aware sentence splitting."""
     text = text.replace("\n", " ")
-    if lang == "ja":
-        sentences = re.split(r'(?<=[。！？])', text)
-    else:
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+    sep = "" if lang == "ja" else " "
+    sentences = split_sentences(text)
 
-    chunks, current = [], ""
+    chunks, buf, length = [], [], 0
     for s in sentences:
-        if len(current) + len(s) <= max_len:
-            current += s
+        if length + len(s) <= max_len:
+            buf.append(s)
+            length += len(s) + len(sep)
         else:
-            if current:
-                chunks.append(current.strip())
-            current = s
-    if current:
-        chunks.append(current.strip())
+            if buf:
+                chunks.append(sep.join(buf).strip())
+            buf, length = [s], len(s) + len(sep)
+    if buf:
+        chunks.append(sep.join(buf).strip())
     return chunks
 
 
@@ -349,7 +349,6 @@ function sendControl(action) {
 function sendChunk(floatData, isFinal) {
     if (!floatData || floatData.length === 0) return;
     const wavBuffer = createWavBuffer(floatData);
-    const audioB64 = arrayBufferToBase64(wavBuffer);
     const nowTs = performance.now();
     const payload = {
         type: "audio_chunk",
@@ -360,10 +359,10 @@ function sendChunk(floatData, isFinal) {
         partial_enabled: partialEnabled,
         word_timestamps: wordTimestamps,
         segment_start_time: (currentSegmentStartTs - recordingStartTs) / 1000.0,
-        segment_end_time: (nowTs - recordingStartTs) / 1000.0,
-        audio_b64: audioB64
+        segment_end_time: (nowTs - recordingStartTs) / 1000.0
     };
-    sendWS(payload);
+    // JSON header, then the WAV itself as a binary frame (no base64)
+    sendWS(payload, wavBuffer);
 
     if (isFinal && ENABLE_LEGACY_TRANSLATION) {
         const blob = new Blob([wavBuffer], { type: "audio/wav" });
@@ -371,19 +370,25 @@ function sendChunk(floatData, isFinal) {
     }
 }
 
-function sendWS(payload) {
+function sendWS(payload, binary = null) {
     if (wsReady && ws && ws.readyState === WebSocket.OPEN) {
-        ws.send(JSON.stringify(payload));
+        sendFrames(payload, binary);
     } else {
-        wsQueue.push(payload);
+        wsQueue.push([payload, binary]);
         if (wsQueue.length > 10) wsQueue.shift();
     }
 }
 
+function sendFrames(payload, binary) {
+    ws.send(JSON.stringify(payload));
+    if (binary) ws.send(binary);
+}
+
 function flushQueue() {
     if (!wsReady || !ws || ws.readyState !== WebSocket.OPEN) return;
     while (wsQueue.length > 0) {
-        ws.send(JSON.stringify(wsQueue.shift()));
+        const [payload, binary] = wsQueue.shift();
+        sendFrames(payload, binary);
     }
 }
 
@@ -448,16 +453,6 @@ function writeString(view, offset, string) {
     }
 }
 
-function arrayBufferToBase64(buffer) {
-    let binary = '';
-    const bytes = new Uint8Array(buffer);
-    const len = bytes.byteLength;
-    for (let i = 0; i < len; i++) {
-        binary += String.fromCharCode(bytes[i]);
-    }
-    return btoa(binary);
-}
-
 async function sendToBackendLegacy(audioBlob, lang) {
     try {
         const formData = new FormData();
@@ -476,14 +471,18 @@ async function sendToBackendLegacy(audioBlob, lang) {
 
         const data = await response.json();
 
-        if (data.status === "success" && data.audio_base64) {
+        if (data.status === "success" && (data.audio_base64 || data.audio_url)) {
             chrome.runtime.sendMessage({
                 type: "TRANSCRIPTION_UPDATE",
                 text: data.translated_text,
                 metadata: data.metadata
             });
             if (voiceoverEnabled) {
-                playBase64Audio(data.audio_base64);
+                if (data.audio_base64) {
+                    playBase64Audio(data.audio_base64);
+                } else {
+                    playAudioUrl(data.audio_url);
+                }
             }
         }
         legacyFailCount = 0;
@@ -502,8 +501,12 @@ async function sendToBackendLegacy(audioBlob, lang) {
 }
 
 function playBase64Audio(base64String) {
+    playAudioUrl("data:audio/wav;base64," + base64String);
+}
+
+function playAudioUrl(url) {
     try {
-        const audio = new Audio("data:audio/wav;base64," + base64String);
+        const audio = new Audio(url);
         audio.volume = Math.max(0, Math.min(1, ttsVolume));
         audio.play().catch(e => console.error("Playback failed:", e));
     } catch (e) {
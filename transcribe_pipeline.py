@@ -1,4 +1,6 @@
 import torch
+import torchaudio
+import numpy as np
 import sys
 import os
 import re
@@ -6,11 +8,18 @@ import argparse
 from datetime import datetime
 import shutil
 import whisper
-import math
 import subprocess
 import tempfile
+import asyncio
+import math
+import difflib
+import hashlib
+import types
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 import importlib
+import importlib.util
 import warnings
 from transformers import logging as hf_logging
 
@@ -41,12 +50,17 @@ from LID_Model.lid import (
     extract_audio_ffmpeg,
     download_youtube_audio,
     is_spoofed_audio,
+    load_audio_array,
+    vad_trim,
+    get_whisper,
     TARGET_LANGS,
+    TARGET_LANGS_SET,
 )
 from ASR_Model.indic_conformer.conformer_asr import IndicConformerASR
 
 # ✅ Import full MT stack
-from MT_Model.mt_model import ISO_TO_FLORES, batch_translate_text
+from MT_Model.lang_maps import ISO_TO_FLORES, CONFORMER_LANGS
+from MT_Model.mt_model import HIGH_QUALITY_BEAMS, batch_translate_text
 from MT_Model.mt_helper import (
     translate_text,
     GLOBAL_LANGS,
@@ -68,16 +82,62 @@ except Exception as e:
     print(f"[WARN] TTS handler unavailable: {e}")
     TTS_AVAILABLE = False
 
-# ===========================
-# Supported languages for IndicConformer (ISO codes only)
-# ===========================
-CONFORMER_LANGS = {
-    'as','bn','brx','doi','gu','hi','kn','kok','ks','mai','ml','mni','mr','ne',
-    'or','pa','sa','sat','sd','ta','te','ur'
-}
+# Optional on-disk transcription cache (pip install diskcache)
+try:
+    import diskcache
+    _TX_CACHE = diskcache.Cache(os.getenv("VASHA_TX_CACHE", os.path.expanduser("~/.vasha_tx_cache")))
+except Exception:
+    _TX_CACHE = None
+# Bump when a change to the decoding path alters the transcript for the same settings
+_TX_CACHE_VERSION = 2
+
+# Decoding settings of the file-transcription path; all of them are part of the cache key
+WHISPER_SIZE = "large"
+FW_SIZE = "large-v2"
+FW_BEAM_SIZE = 5
+VAD_MIN_SILENCE_MS = 500
+
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+# Precompiled patterns used on every transcription / download
+_YTID_RE = re.compile(r"(?:v=|be/)([A-Za-z0-9_-]{11})")
+_NON_WORD_RE = re.compile(r'\W+')
 
 # ✅ Supported languages for Whisper (ISO codes in TARGET_LANGS)
-WHISPER_LANGS = set(TARGET_LANGS.keys())
+WHISPER_LANGS = TARGET_LANGS_SET
+
+# Voice descriptions for the TTS step, keyed by ISO code
+_TTS_VOICE_DESC = {
+    "hi": "Sunita speaks in a calm, neutral Hindi voice with clear audio and no background noise.",
+    "en": "A neutral English speaker speaks with a clear, moderately-paced British/Indian-accented voice.",
+    "ta": "Jaya speaks in a calm Tamil voice with natural prosody and clear audio.",
+    "te": "Prakash speaks in a calm Telugu voice with natural prosody and clear audio.",
+    "kn": "Suresh speaks in a calm Kannada voice with clear audio and no background noise.",
+}
+_DEFAULT_TTS_DESC = "The speaker speaks naturally in clear audio with no background noise."
+
+
+def _build_lang_profiles():
+    """Resolve every per-language lookup once; keyed by both ISO and FLORES code."""
+    profiles = {}
+    for iso in TARGET_LANGS:
+        flores = ISO_TO_FLORES.get(iso, iso)
+        profile = types.SimpleNamespace(
+            iso=iso,
+            flores=flores,
+            tts_desc=_TTS_VOICE_DESC.get(iso, _DEFAULT_TTS_DESC),
+            conformer_ok=iso in CONFORMER_LANGS,
+            whisper_ok=iso in WHISPER_LANGS,
+        )
+        profiles[iso] = profile
+        profiles.setdefault(flores, profile)
+    return profiles
+
+
+LANG_PROFILE = _build_lang_profiles()
 
 
 # -------------------
@@ -140,45 +200,103 @@ def user_select_tts():
         return "xtts"
 
 
-def download_youtube_audio_cached(url):
+def _is_wav_file(path):
+    """Check the RIFF/WAVE header instead of guessing from file size."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(12)
+    except OSError:
+        return False
+    return len(header) == 12 and header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+
+
+def _commit_to_cache(src_path, cached_path):
+    # Move next to the destination first, then atomically swap it in, so an
+    # interrupted run never leaves a half-written file under the cache name.
+    tmp_path = cached_path + ".part"
+    shutil.move(src_path, tmp_path)
+    os.replace(tmp_path, cached_path)
+
+
+def _cached_wav_ok(cached_path):
+    """True for a valid cached WAV; a corrupt entry is removed so it gets rebuilt."""
+    try:
+        have_cached = os.stat(cached_path).st_size > 44
+    except FileNotFoundError:
+        return False
+    if have_cached and _is_wav_file(cached_path):
+        return True
+    print(f"⚠️ Cached file seems corrupted, rebuilding: {cached_path}")
+    os.remove(cached_path)
+    return False
+
+
+def download_youtube_audio_cached(url, use_cache=True):
+    if not use_cache:
+        return download_youtube_audio(url)
+
     cache_dir = os.path.join(os.getcwd(), "youtube_cache")
     os.makedirs(cache_dir, exist_ok=True)
 
-    match = re.search(r"(?:v=|be/)([A-Za-z0-9_-]{11})", url)
+    match = _YTID_RE.search(url)
     if match:
         video_id = match.group(1)
     else:
-        video_id = re.sub(r'\W+', '', url)
+        video_id = _NON_WORD_RE.sub('', url)
 
     cached_path = os.path.join(cache_dir, f"{video_id}.wav")
 
-    if os.path.exists(cached_path):
-        if os.path.getsize(cached_path) > 1024:
-            print(f"⚡ Using cached YouTube audio: {cached_path}")
-            return cached_path
-        else:
-            print(f"⚠️ Cached file seems corrupted, re-downloading: {cached_path}")
-            os.remove(cached_path)
+    if _cached_wav_ok(cached_path):
+        print(f"⚡ Using cached YouTube audio: {cached_path}")
+        return cached_path
 
     print("⬇️ Downloading YouTube audio...")
     try:
         path = download_youtube_audio(url)
-        shutil.move(path, cached_path)
+        _commit_to_cache(path, cached_path)
         return cached_path
     except Exception as e:
         print(f"❌ YouTube download failed: {e}")
         try:
             print("🔁 Retrying download...")
             path = download_youtube_audio(url)
-            shutil.move(path, cached_path)
+            _commit_to_cache(path, cached_path)
             return cached_path
         except Exception as e2:
             print(f"❌ Fallback YouTube download also failed: {e2}")
             raise RuntimeError("YouTube download failed after retry.")
 
 
+def extract_audio_cached(video_path, use_cache=True):
+    """ffmpeg audio extraction cached by sha1(first 1 MiB + file size) of the video."""
+    if not use_cache:
+        return extract_audio_ffmpeg(video_path)
+
+    cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "vasha", "audio")
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(video_path, "rb") as f:
+        head = f.read(1 << 20)
+    key = hashlib.sha1(head + str(os.stat(video_path).st_size).encode()).hexdigest()
+    cached_path = os.path.join(cache_dir, f"{key}.wav")
+
+    if _cached_wav_ok(cached_path):
+        print(f"⚡ Using cached extracted audio: {cached_path}")
+        return cached_path
+
+    _commit_to_cache(extract_audio_ffmpeg(video_path), cached_path)
+    return cached_path
+
+
 # ---------- ffmpeg utilities ----------
 def get_duration_ffprobe(path):
+    # Header-only read first; ffprobe fork is only needed for containers
+    # the torchaudio backend can't parse (mp4/mkv/webm, ...).
+    try:
+        info = torchaudio.info(path)
+        if info.sample_rate > 0 and info.num_frames > 0:
+            return info.num_frames / info.sample_rate
+    except Exception:
+        pass
     cmd = [
         "ffprobe", "-v", "error", "-show_entries", "format=duration",
         "-of", "default=noprint_wrappers=1:nokey=1", path
@@ -190,148 +308,384 @@ def get_duration_ffprobe(path):
         return 0.0
 
 
-def extract_chunk_ffmpeg(src, start, duration, dst):
-    cmd = [
-        "ffmpeg", "-hide_banner", "-loglevel", "error",
-        "-ss", str(max(0.0, start)),
-        "-t", str(duration),
-        "-i", src,
-        "-ar", "16000", "-ac", "1", "-vn", dst
+def make_vad_chunks(audio, chunk_length=120, sample_rate=16000, min_silence_ms=VAD_MIN_SILENCE_MS):
+    """
+    Pick chunk boundaries inside silences found by Silero VAD (shipped with
+    faster-whisper). Speech regions are packed greedily into windows of at most
+    `chunk_length` seconds and cut at the middle of a silence gap, so chunks never
+    overlap and words are not split. Returns None when the VAD is unavailable.
+    """
+    try:
+        from faster_whisper.vad import get_speech_timestamps, VadOptions
+    except Exception:
+        return None
+
+    pcm = load_audio_array(audio, sample_rate)
+    speech = get_speech_timestamps(pcm, VadOptions(min_silence_duration_ms=min_silence_ms))
+    if not speech:
+        return []
+
+    max_len = int(chunk_length * sample_rate)
+    bounds = []
+    cur_start = speech[0]['start']
+    prev_end = None
+    for ts in speech:
+        if prev_end is not None and ts['end'] - cur_start > max_len:
+            cut = (prev_end + ts['start']) // 2
+            bounds.append((cur_start, cut))
+            cur_start = cut
+        # a single region longer than the window still has to be hard-split
+        while ts['end'] - cur_start > max_len:
+            bounds.append((cur_start, cur_start + max_len))
+            cur_start += max_len
+        prev_end = ts['end']
+    bounds.append((cur_start, prev_end))
+    return [(pcm[a:b], a / sample_rate) for a, b in bounds if b > a]
+
+
+def chunk_audio_overlapping(audio, chunk_s=30, overlap_s=1.0, sample_rate=16000):
+    """
+    Fixed windows of at most `chunk_s` seconds overlapping by `overlap_s`. The
+    window is shrunk so the file tiles evenly and the last chunk isn't a short,
+    mostly-padded tail. Neighbouring hypotheses are merged with _merge_overlap_tokens.
+    """
+    pcm = load_audio_array(audio, sample_rate)
+    total = len(pcm) / sample_rate
+    if total <= chunk_s:
+        return [(pcm, 0.0)]
+    n = math.ceil((total - overlap_s) / (chunk_s - overlap_s))
+    step = (total - overlap_s) / n
+    win = step + overlap_s
+    return [
+        (pcm[int(i * step * sample_rate):int(min(total, i * step + win) * sample_rate)], i * step)
+        for i in range(n)
     ]
-    subprocess.run(cmd, check=True)
-
-
-def make_overlapped_chunks(audio_path, chunk_length=120, overlap=5):
-    total = get_duration_ffprobe(audio_path)
-    if total == 0.0:
-        return [(audio_path, 0.0)]
-    tmpdir = tempfile.mkdtemp(prefix="chunks_")
-    starts = []
-    step = chunk_length - overlap
-    s = 0.0
-    while s < total:
-        starts.append(s)
-        s += step
-    chunks = []
-    for idx, s in enumerate(starts):
-        remaining = max(0.0, total - s)
-        dur = min(chunk_length + (overlap if idx > 0 else 0), remaining)
-        start_for_extract = max(0.0, s - (overlap if idx > 0 else 0))
-        out_path = os.path.join(tmpdir, f"chunk_{idx:03d}.wav")
-        extract_chunk_ffmpeg(audio_path, start_for_extract, dur, out_path)
-        chunks.append((out_path, s))
-    return chunks
 
 
-# ---------- Whisper + faster-whisper workers ----------
-def _transcribe_one_chunk_whisper(model, chunk_path, lang_input, use_word_ts=False):
+def stream_audio_chunks(audio_path, chunk_s=30, overlap_s=1.0, sample_rate=16000):
     """
-    use_word_ts=False avoids Whisper's Triton-based timing (median_filter, DTW).
-    On Windows Triton often fails -> slow CPU fallbacks + warnings. Segment-level
-    timing is still returned; _stitch_segments does not need word-level.
+    Yield (pcm, start_sec) windows of `chunk_s` seconds overlapping by `overlap_s`,
+    read incrementally from an ffmpeg pipe. Only one window is held in memory, so
+    hour-long inputs don't need a full decode up front.
     """
-    res = model.transcribe(
-        chunk_path,
-        task="transcribe",
-        language=lang_input,
-        word_timestamps=use_word_ts,
-        verbose=False
-    )
-    return {'segments': res.get('segments', []), 'text': res.get('text', '')}
+    win = int(chunk_s * sample_rate)
+    step = win - int(overlap_s * sample_rate)
+    cmd = ["ffmpeg", "-nostdin", "-i", audio_path, "-vn", "-f", "f32le", "-ac", "1", "-ar", str(sample_rate), "-"]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        buf = np.empty(0, dtype=np.float32)
+        pos = 0
+        while True:
+            need = win - len(buf)
+            new = np.frombuffer(proc.stdout.read(need * 4), dtype=np.float32)
+            if pos and len(new) == 0:
+                break  # what's left is the overlap of the previous window
+            buf = np.concatenate([buf, new])
+            if len(buf) == 0:
+                break
+            yield buf, pos / sample_rate
+            if len(new) < need:
+                break
+            buf = buf[step:]
+            pos += step
+    finally:
+        proc.stdout.close()
+        proc.wait()
 
 
-def _transcribe_one_chunk_faster(fw_model, chunk_path, lang_input, beam_size=5, use_word_ts=False):
+# ---------- Whisper + faster-whisper workers ----------
+def _transcribe_one_chunk_faster(fw_model, chunk_audio, lang_input, beam_size=FW_BEAM_SIZE, use_word_ts=False):
     segments_gen, info = fw_model.transcribe(
-        chunk_path,
+        chunk_audio,
         beam_size=beam_size,
         language=lang_input,
         word_timestamps=use_word_ts,
         vad_filter=True,
-        vad_parameters=dict(min_silence_duration_ms=500),
+        vad_parameters=dict(min_silence_duration_ms=VAD_MIN_SILENCE_MS),
         condition_on_previous_text=False,
         temperature=0
     )
-    segs = [{'start': seg.start, 'end': seg.end, 'text': seg.text} for seg in segments_gen]
-    full_text = " ".join(s['text'] for s in segs)
+    segs = [{'start': seg.start, 'end': seg.end, 'text': seg.text.strip()} for seg in segments_gen]
+    full_text = " ".join(s['text'] for s in segs if s['text'])
     return {'segments': segs, 'text': full_text}
 
 
+# whisper.transcribe's defaults for falling back to a temperature-sweep decode
+_COMPRESSION_RATIO_THRESHOLD = 2.4
+_LOGPROB_THRESHOLD = -1.0
+_NO_SPEECH_THRESHOLD = 0.6
+
+
+def _transcribe_batched_whisper(model, chunks, lang_input, batch_size=8):
+    """
+    Decode <=30 s chunks in batches: one encoder pass per batch instead of one
+    model.transcribe() call per chunk. Returns the token ids of each chunk.
+    Chunks whose greedy decode hits sample_len or fails the compression-ratio /
+    avg-logprob checks are redone with model.transcribe (seek loop + temperature
+    fallback); chunks judged silent come back empty, as transcribe would drop them.
+    """
+    options = whisper.DecodingOptions(
+        task="transcribe",
+        language=lang_input,
+        without_timestamps=True,
+        fp16=torch.cuda.is_available(),
+    )
+    sample_len = model.dims.n_text_ctx // 2  # DecodingOptions.sample_len default
+    eot = whisper.tokenizer.get_tokenizer(
+        model.is_multilingual, num_languages=model.num_languages, language=lang_input, task="transcribe"
+    ).eot
+    n_mels = model.dims.n_mels
+    tokens = []
+    redone = 0
+    # chunks may be a list or a lazy generator (stream_audio_chunks)
+    total = math.ceil(len(chunks) / batch_size) if hasattr(chunks, "__len__") else None
+    it = iter(chunks)
+    with tqdm(total=total, desc="Transcribing chunks (batched)", unit="batch") as pbar:
+        while True:
+            batch = list(itertools.islice(it, batch_size))
+            if not batch:
+                break
+            mels = torch.stack([
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(ch)), n_mels=n_mels)
+                for ch, _ in batch
+            ]).to(model.device)
+            for (ch, _), r in zip(batch, whisper.decode(model, mels, options)):
+                if r.no_speech_prob > _NO_SPEECH_THRESHOLD and r.avg_logprob < _LOGPROB_THRESHOLD:
+                    tokens.append([])
+                elif (len(r.tokens) >= sample_len
+                      or r.compression_ratio > _COMPRESSION_RATIO_THRESHOLD
+                      or r.avg_logprob < _LOGPROB_THRESHOLD):
+                    res = model.transcribe(
+                        ch, task="transcribe", language=lang_input, fp16=options.fp16,
+                        condition_on_previous_text=False, verbose=None,
+                    )
+                    tokens.append([t for seg in res.get("segments", []) for t in seg["tokens"] if t < eot])
+                    redone += 1
+                else:
+                    tokens.append(list(r.tokens))
+            pbar.update(1)
+    if redone:
+        print(f"🔁 Re-decoded {redone} chunk(s) with model.transcribe (truncated or low-confidence)")
+    return tokens
+
+
+def _merge_overlap_tokens(token_lists, window=32, min_match=2):
+    """
+    Splice consecutive chunk hypotheses at the middle of the longest common
+    token run between the tail of one and the head of the next.
+    """
+    merged = list(token_lists[0]) if token_lists else []
+    for nxt in token_lists[1:]:
+        tail = merged[-window:]
+        head = nxt[:window]
+        m = difflib.SequenceMatcher(None, tail, head, autojunk=False).find_longest_match(0, len(tail), 0, len(head))
+        if m.size >= min_match:
+            cut = m.size // 2
+            merged = merged[:len(merged) - len(tail) + m.a + cut] + list(nxt[m.b + cut:])
+        else:
+            merged.extend(nxt)
+    return merged
+
+
 def _stitch_segments(all_segment_lists, overlap_guard=0.3):
-    merged = []
-    last_end = 0.0
+    texts, starts, ends = [], [], []
     for segments, offset in all_segment_lists:
         for seg in segments:
-            s = float(seg.get('start', 0.0)) + offset
-            e = float(seg.get('end', s)) + offset
             text = seg.get('text', '').strip()
             if not text:
                 continue
-            if s < (last_end - overlap_guard):
-                if merged and text.startswith(merged[-1]['text'][-30:]):
-                    text = text[len(merged[-1]['text'][-30:]):].lstrip()
-                if not text:
-                    continue
-                s = max(s, last_end)
-            merged.append({'start': s, 'end': e, 'text': text})
-            last_end = max(last_end, e)
-    pieces = [m['text'] for m in merged]
-    out = " ".join(pieces)
-    out = re.sub(r'\s+', ' ', out).strip()
-    return out
+            s = float(seg.get('start', 0.0)) + offset
+            texts.append(text)
+            starts.append(s)
+            ends.append(float(seg.get('end', s)) + offset)
+    if not texts:
+        return ""
+
+    # Overlap test is vectorized: a segment overlaps when it starts before the
+    # running max end of everything before it. Only those few go through the
+    # Python text dedupe below.
+    abs_e = np.asarray(ends, dtype=np.float64)
+    prev_end = np.empty_like(abs_e)
+    prev_end[0] = 0.0
+    np.maximum.accumulate(abs_e[:-1], out=prev_end[1:])
+    overlapping = np.flatnonzero(np.asarray(starts, dtype=np.float64) < prev_end - overlap_guard)
+
+    for i in overlapping:
+        j = i - 1
+        while j >= 0 and not texts[j]:
+            j -= 1
+        if j < 0:
+            continue
+        tail = texts[j][-30:]
+        if texts[i].startswith(tail):
+            texts[i] = texts[i][len(tail):].lstrip()
+    return " ".join(t for t in texts if t)
+
+
+# ---------- ASR model cache ----------
+# One instance per configuration for the whole process, shared by transcribe()
+# and the pipelined ASR->MT path (openai-whisper goes through lid.get_whisper).
+_FW_MODELS = {}
+_CONFORMER = None
+
+
+def fw_compute_type(device):
+    """CTranslate2 compute type: VASHA_FW_COMPUTE, else float16 on GPU / int8 on CPU."""
+    return os.getenv("VASHA_FW_COMPUTE") or ("float16" if device == "cuda" else "int8")
+
+
+def _get_faster_whisper(model_size="large-v2", device=None, compute_type=None, num_workers=1):
+    """num_workers > 1 lets that many threads call transcribe() truly in parallel."""
+    from faster_whisper import WhisperModel
+    device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+    compute_type = compute_type or fw_compute_type(device)
+    key = (model_size, device, compute_type, num_workers)
+    if key not in _FW_MODELS:
+        print(f"⚡ Loading faster-whisper model ({model_size}) on {device} [{compute_type}] ...")
+        kwargs = {"num_workers": num_workers}
+        if device == "cpu":
+            # split the cores between the parallel workers
+            kwargs["cpu_threads"] = max(1, (os.cpu_count() or 2) // 2 // num_workers)
+        _FW_MODELS[key] = WhisperModel(model_size, device=device, compute_type=compute_type, **kwargs)
+    return _FW_MODELS[key]
+
+
+def _get_conformer():
+    global _CONFORMER
+    if _CONFORMER is None:
+        _CONFORMER = IndicConformerASR()
+    return _CONFORMER
 
 
 # -------------------
 # Main transcription
 # -------------------
-def transcribe(audio_path, language_code, session_dir, asr_model, chunk_length=120, overlap=5, workers=1):
-    print(f"📝 Transcribing with {asr_model}...")
+def _audio_digest(path, block_size=1 << 20):
+    h = _blake3() if _blake3 is not None else hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()[:32]
+
+
+def _run_asr(audio_path, language_code, asr_model, chunk_length, overlap, workers=1):
+    """
+    workers only affects the faster-whisper chunk loop (CTranslate2 releases the GIL,
+    so threads run in parallel). openai-whisper batches chunks on one model instead,
+    and IndicConformer decodes the whole file in one call.
+    """
     lang_input = get_language_for_model(language_code)
+    audio_length = get_duration_ffprobe(audio_path) if asr_model in ("whisper", "faster") else 0.0
 
     if asr_model == "whisper":
-        model = whisper.load_model("large")
-        audio_length = math.ceil(os.path.getsize(audio_path) / (16000*2))
+        model = get_whisper(WHISPER_SIZE)
         if audio_length > chunk_length:
             print("⏳ Long audio detected. Splitting...")
-            chunks = make_overlapped_chunks(audio_path, chunk_length=chunk_length, overlap=overlap)
-            results_by_index = {}
-            for i, (ch_path, start) in enumerate(tqdm(chunks, desc="Transcribing chunks", unit="chunk"), 0):
-                out = _transcribe_one_chunk_whisper(model, ch_path, lang_input)
-                results_by_index[i] = (out['segments'], start)
-            ordered = [results_by_index[i] for i in sorted(results_by_index.keys())]
-            transcribed_text = _stitch_segments(ordered)
+            # Whisper's decoder window is 30 s; silence cuts need no merge,
+            # fixed overlapping windows are spliced by token LCS. Without the VAD
+            # the windows are streamed, so the file is never decoded whole.
+            chunks = make_vad_chunks(audio_path, chunk_length=30)
+            overlapped = chunks is None
+            if overlapped:
+                chunks = stream_audio_chunks(audio_path, chunk_s=30, overlap_s=1.0)
+            tokens = _transcribe_batched_whisper(model, chunks, lang_input) if chunks else []
+            tokenizer = whisper.tokenizer.get_tokenizer(
+                model.is_multilingual, num_languages=model.num_languages,
+                language=lang_input, task="transcribe",
+            )
+            if overlapped:
+                transcribed_text = tokenizer.decode(_merge_overlap_tokens(tokens)).strip()
+            else:
+                transcribed_text = " ".join(t for t in (tokenizer.decode(tk).strip() for tk in tokens) if t)
         else:
-            result = model.transcribe(audio_path, task="transcribe", language=lang_input)
+            result = model.transcribe(vad_trim(load_audio_array(audio_path)), task="transcribe", language=lang_input,
+                                      fp16=model.device.type == "cuda")
             transcribed_text = result["text"]
 
     elif asr_model == "faster":
-        from faster_whisper import WhisperModel
-        model_size = "large-v2"
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"⚡ Loading faster-whisper model ({model_size}) on {device} ...")
-        fw_model = WhisperModel(model_size, device=device, compute_type="float16")
-        audio_length = math.ceil(os.path.getsize(audio_path) / (16000*2))
-        if audio_length > chunk_length:
-            chunks = make_overlapped_chunks(audio_path, chunk_length=chunk_length, overlap=overlap)
-            results_by_index = {}
-            for i, (ch_path, start) in enumerate(tqdm(chunks, desc="Transcribing chunks (faster-whisper)", unit="chunk"), 0):
+        workers = max(1, int(workers or 1))
+        fw_model = _get_faster_whisper(FW_SIZE, num_workers=workers)
+        try:
+            from faster_whisper import BatchedInferencePipeline
+        except ImportError:
+            BatchedInferencePipeline = None
+        if audio_length > chunk_length and BatchedInferencePipeline is not None:
+            # VAD-cut 30 s windows encoded and decoded as one batch per step
+            batched = BatchedInferencePipeline(model=fw_model)
+            segments, info = batched.transcribe(audio_path, batch_size=8, beam_size=FW_BEAM_SIZE, language=lang_input)
+            transcribed_text = " ".join(t for t in (s.text.strip() for s in segments) if t)
+        elif audio_length > chunk_length:
+            chunks = make_vad_chunks(audio_path, chunk_length=chunk_length)
+            if chunks is None:
+                chunks = stream_audio_chunks(audio_path, chunk_s=chunk_length, overlap_s=overlap)
+            def _one(item):
+                i, (ch_audio, start) = item
                 try:
-                    out = _transcribe_one_chunk_faster(fw_model, ch_path, lang_input)
+                    out = _transcribe_one_chunk_faster(fw_model, ch_audio, lang_input)
                 except Exception as e:
                     print(f"❌ faster-whisper chunk {i} failed: {e}")
                     out = {'segments': [], 'text': ''}
-                results_by_index[i] = (out['segments'], start)
-            ordered = [results_by_index[i] for i in sorted(results_by_index.keys())]
+                return (out['segments'], start)
+
+            # pull `workers` chunks at a time so a streamed source stays lazy
+            ordered = []
+            it = enumerate(chunks)
+            with ThreadPoolExecutor(max_workers=workers) as pool, \
+                    tqdm(desc="Transcribing chunks (faster-whisper)", unit="chunk") as pbar:
+                while True:
+                    group = list(itertools.islice(it, workers))
+                    if not group:
+                        break
+                    ordered.extend(pool.map(_one, group))
+                    pbar.update(len(group))
             transcribed_text = _stitch_segments(ordered)
         else:
-            segments, info = fw_model.transcribe(audio_path, beam_size=5, language=lang_input)
-            segs = [{'start': s.start, 'end': s.end, 'text': s.text} for s in segments]
-            transcribed_text = " ".join(s['text'] for s in segs)
+            segments, info = fw_model.transcribe(audio_path, beam_size=FW_BEAM_SIZE, language=lang_input,
+                                                 vad_filter=True, vad_parameters=dict(min_silence_duration_ms=VAD_MIN_SILENCE_MS))
+            transcribed_text = " ".join(t for t in (s.text.strip() for s in segments) if t)
 
     elif asr_model == "conformer":
-        conformer = IndicConformerASR()
-        transcribed_text = conformer.transcribe(audio_path, get_language_for_model(language_code), decoder_type="ctc")
+        conformer = _get_conformer()
+        # drop non-speech before the CTC pass; whisper/faster-whisper already VAD their input
+        speech = vad_trim(load_audio_array(audio_path))
+        if len(speech) == 0:
+            transcribed_text = ""
+        else:
+            transcribed_text = conformer.transcribe(speech, lang_input, decoder_type="ctc")
     else:
         raise ValueError("Invalid ASR model selected.")
+    return transcribed_text
+
+
+def _tx_cache_key(audio_path, asr_model, lang_input, chunk_length, overlap):
+    """Everything that changes the transcript: audio, backend and its model/precision/decoding settings."""
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    if asr_model == "whisper":
+        cfg = f"{WHISPER_SIZE}:{device}:vad{VAD_MIN_SILENCE_MS}"
+    elif asr_model == "faster":
+        cfg = f"{FW_SIZE}:{fw_compute_type(device)}:beam{FW_BEAM_SIZE}:vad{VAD_MIN_SILENCE_MS}"
+    else:
+        cfg = f"ctc:{device}"
+    return f"v{_TX_CACHE_VERSION}:{_audio_digest(audio_path)}:{asr_model}:{cfg}:{lang_input}:{chunk_length}:{overlap}"
+
+
+def transcribe(audio_path, language_code, session_dir, asr_model, chunk_length=120, overlap=5, workers=1, use_cache=True):
+    print(f"📝 Transcribing with {asr_model}...")
+
+    cache_key = None
+    if use_cache and _TX_CACHE is not None:
+        try:
+            cache_key = _tx_cache_key(audio_path, asr_model, get_language_for_model(language_code), chunk_length, overlap)
+        except OSError:
+            cache_key = None
+
+    transcribed_text = _TX_CACHE.get(cache_key) if cache_key else None
+    if transcribed_text is not None:
+        print("⚡ Using cached transcription")
+    else:
+        transcribed_text = _run_asr(audio_path, language_code, asr_model, chunk_length, overlap, workers=workers)
+        if cache_key:
+            _TX_CACHE.set(cache_key, transcribed_text)
 
     print("\n🗣 Transcribed Text:")
     print(transcribed_text)
@@ -344,6 +698,102 @@ def transcribe(audio_path, language_code, session_dir, asr_model, chunk_length=1
     return transcribed_text
 
 
+# -------------------
+# Pipelined ASR -> MT
+# -------------------
+async def _asr_mt_pipeline(chunks, transcribe_batch, translate_one, batch_size=4, mt_concurrency=1):
+    """
+    Producer transcribes chunks in mini-batches; every finished chunk is handed
+    to MT right away, so translation of early chunks overlaps ASR of later ones.
+    Blocking model calls run in worker threads via asyncio.to_thread.
+    Local MT models share tokenizer/processor state, so mt_concurrency > 1 is only safe for Google.
+    """
+    queue = asyncio.Queue()
+    n = len(chunks)
+    sources = [""] * n
+    translations = [""] * n
+    mt_slots = asyncio.Semaphore(mt_concurrency)
+
+    async def producer():
+        for i in range(0, n, batch_size):
+            texts = await asyncio.to_thread(transcribe_batch, chunks[i:i + batch_size])
+            for j, text in enumerate(texts):
+                await queue.put((i + j, text.strip()))
+        await queue.put(None)
+
+    async def translate(idx, text):
+        sources[idx] = text
+        if text:
+            async with mt_slots:
+                translations[idx] = await asyncio.to_thread(translate_one, text)
+
+    async def consumer():
+        tasks = []
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            tasks.append(asyncio.create_task(translate(*item)))
+        await asyncio.gather(*tasks)
+
+    await asyncio.gather(producer(), consumer())
+    join = lambda parts: " ".join(t for t in parts if t)
+    return join(sources), join(translations)
+
+
+def transcribe_translate_pipelined(audio_path, language_code, tgt_lang, session_dir, asr_model, backend_choice=None, batch_size=4, num_beams=1):
+    print(f"📝 Transcribing with {asr_model} and translating to {tgt_lang} as chunks finish...")
+    lang_input = get_language_for_model(language_code)
+
+    if asr_model == "whisper":
+        model = get_whisper(WHISPER_SIZE)
+        tokenizer = whisper.tokenizer.get_tokenizer(
+            model.is_multilingual, num_languages=model.num_languages,
+            language=lang_input, task="transcribe",
+        )
+        def transcribe_batch(batch):
+            tokens = _transcribe_batched_whisper(model, batch, lang_input, batch_size=len(batch))
+            return [tokenizer.decode(tk) for tk in tokens]
+    elif asr_model == "faster":
+        fw_model = _get_faster_whisper(FW_SIZE)
+        def transcribe_batch(batch):
+            return [_transcribe_one_chunk_faster(fw_model, ch, lang_input)['text'] for ch, _ in batch]
+    elif asr_model == "conformer":
+        conformer = _get_conformer()
+        def transcribe_batch(batch):
+            return [str(conformer.transcribe(audio_path, lang_input, decoder_type="ctc"))]
+    else:
+        raise ValueError("Invalid ASR model selected.")
+
+    if asr_model == "conformer":
+        chunks = [(audio_path, 0.0)]
+    else:
+        # no overlap: each chunk is translated on its own, so there is nothing to merge
+        pcm = load_audio_array(audio_path)
+        chunks = make_vad_chunks(pcm, chunk_length=30)
+        if chunks is None:
+            chunks = chunk_audio_overlapping(pcm, chunk_s=30, overlap_s=0.0)
+
+    def translate_one(text):
+        return perform_translation(text, language_code, tgt_lang, backend_choice=backend_choice, num_beams=num_beams)
+
+    transcribed_text, translated = asyncio.run(
+        _asr_mt_pipeline(
+            chunks, transcribe_batch, translate_one, batch_size=batch_size,
+            # Google calls are independent network requests; IndicTrans2/NLLB run one at a time
+            mt_concurrency=4 if (backend_choice or "").lower() == "google" else 1,
+        )
+    )
+
+    print("\n🗣 Transcribed Text:")
+    print(transcribed_text)
+    output_path = os.path.join(session_dir, f"output_{language_code}_{asr_model}.txt")
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(transcribed_text)
+    print(f"\n💾 Transcription saved to: {output_path}")
+    return transcribed_text, translated
+
+
 # -------------------
 # Script entry
 # -------------------
@@ -358,6 +808,11 @@ if __name__ == "__main__":
     parser.add_argument('--chunk-len', type=int, default=120)
     parser.add_argument('--overlap', type=int, default=5)
     parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--no-cache', action='store_true', help="Bypass the audio extraction/download and transcription caches")
+    parser.add_argument('--stream-mt', type=str, default="", metavar="FLORES",
+                        help="Translate each ASR chunk to this FLORES code as soon as it is transcribed (skips the MT menus, auto backend)")
+    parser.add_argument('--quality', action='store_true',
+                        help=f"Use {HIGH_QUALITY_BEAMS}-beam search for MT instead of greedy decoding (slower)")
     parser.add_argument('--backtranslate', action="store_true", help="Enable back-translation debug mode")
 
     # --- TTS CLI options ---
@@ -379,126 +834,145 @@ if __name__ == "__main__":
 
     # Input
     if args.file:
-        audio_path = extract_audio_ffmpeg(args.file) if args.file.lower().endswith(('.mp4','.mkv','.mov','.avi')) else args.file
+        audio_path = extract_audio_cached(args.file, use_cache=not args.no_cache) if args.file.lower().endswith(('.mp4','.mkv','.mov','.avi')) else args.file
     elif args.youtube:
-        audio_path = download_youtube_audio_cached(args.youtube)
+        audio_path = download_youtube_audio_cached(args.youtube, use_cache=not args.no_cache)
     elif args.mic:
         audio_path = record_live_audio(duration=args.duration)
     else:
         sys.exit(1)
 
-    # LID
-    lid = LanguageIdentifier()
-    lang_code, _ = lid.detect(audio_path)
+    # Decode once; LID, dialect and spoof checks all reuse the array
+    audio_pcm = load_audio_array(audio_path)
+
+    # LID — reuse the ASR model when Whisper large was requested up front
+    if args.asr == "whisper":
+        lid = LanguageIdentifier(shared_model=get_whisper(WHISPER_SIZE))
+    else:
+        lid = LanguageIdentifier()
+    lang_code, _ = lid.detect(audio_pcm)
     if not lang_code:
         print("❌ Language not detected.")
         sys.exit(1)
 
     # ASR
     selected_asr = args.asr if args.asr else user_select_asr(lang_code)
-    transcribed = transcribe(audio_path, lang_code, session_dir, selected_asr,
-                             chunk_length=args.chunk_len, overlap=args.overlap, workers=args.workers)
-
-    # ===================
-    # MT Mode Selection
-    # ===================
-    print("\n🤖 Select MT Mode:")
-    print("1. Meta-NLLB (Global)")
-    print("2. IndicTrans2 (Indian languages, fallback to NLLB)")
-    print("3. Google Translate (free API wrapper)")
-    print("4. Transliteration (script-only, no meaning change)")
-    print("5. Code-mixed handling (Hindi+English, etc.)")
-    mt_choice = input("👉 Enter 1-5 (default=1): ").strip() or "1"
-
-    mt_model_choice = "nllb"
-    mode = None
-    translit_scheme = None
-    code_mixed_english_action = "pass"
-
-    if mt_choice == "2":
-        mt_model_choice = "indic"
-    elif mt_choice == "3":
-        mt_model_choice = "google"
-        # Ensure googletrans is available; otherwise fall back to NLLB to avoid [translation_error]
-        try:
-            from googletrans import Translator
-            Translator()
-        except Exception:
-            print("⚠️ googletrans not available. Install with: pip install googletrans==4.0.0-rc1")
-            print("   Falling back to Meta-NLLB for this run. (Or re-run and choose MT mode 1 or 2.)")
-            mt_model_choice = "nllb"
-    elif mt_choice == "4":
-        mode = "transliterate"
-    elif mt_choice == "5":
-        mode = "code_mixed"
-
-    # Target language menus
-    if mode == "transliterate":
-        print("\n🔤 Transliteration selected — choose Latin scheme:")
-        print("1. ITRANS (default)")
-        print("2. IAST")
-        print("3. HK (Harvard-Kyoto)")
-        ts_choice = input("👉 Enter 1-3 (default=1): ").strip()
-        if ts_choice == "2":
-            translit_scheme = "IAST"
-        elif ts_choice == "3":
-            translit_scheme = "HK"
-        else:
-            translit_scheme = "ITRANS"
-        # 🔄 Fix: tgt_lang irrelevant, set equal to src
-        tgt_lang = lang_code
+    mt_beams = HIGH_QUALITY_BEAMS if args.quality else 1
+    streamed_translation = None
+    if args.stream_mt:
+        tgt_lang = args.stream_mt
+        transcribed, streamed_translation = transcribe_translate_pipelined(
+            audio_path, lang_code, tgt_lang, session_dir, selected_asr, num_beams=mt_beams)
+        mt_model_choice = None
+        mode = None
+        translit_scheme = None
+        code_mixed_english_action = "pass"
+        dbg_choice = "stream"
     else:
-        print("\n🌍 Choose target translation language:")
-        print("=== Global Languages ===")
-        for key,(name,iso) in GLOBAL_LANGS.items():
-            flores = ISO_TO_FLORES.get(iso, iso)
-            print(f"{key}. {name} ({flores})")
-        print("\n=== Indian Languages ===")
-        for key,(name,iso) in INDIC_LANGS_MENU.items():
-            flores = ISO_TO_FLORES.get(iso, iso)
-            print(f"{key}. {name} ({flores})")
-        print("0. Custom FLORES code")
-
-        choice = input("👉 Enter choice (default=1 for English): ").strip()
-        if choice == "" or choice == "1":
-            tgt_lang = ISO_TO_FLORES["en"]
-        elif choice == "0":
-            tgt_lang = input("🔤 Enter custom FLORES code: ").strip()
-        elif choice in GLOBAL_LANGS:
-            iso = GLOBAL_LANGS[choice][1]
-            tgt_lang = ISO_TO_FLORES.get(iso, "eng_Latn")
-        elif choice in INDIC_LANGS_MENU:
-            iso = INDIC_LANGS_MENU[choice][1]
-            tgt_lang = ISO_TO_FLORES.get(iso, iso)
+        transcribed = transcribe(audio_path, lang_code, session_dir, selected_asr,
+                                 chunk_length=args.chunk_len, overlap=args.overlap, workers=args.workers,
+                                 use_cache=not args.no_cache)
+
+        # ===================
+        # MT Mode Selection
+        # ===================
+        print("\n🤖 Select MT Mode:")
+        print("1. Meta-NLLB (Global)")
+        print("2. IndicTrans2 (Indian languages, fallback to NLLB)")
+        print("3. Google Translate (free API wrapper)")
+        print("4. Transliteration (script-only, no meaning change)")
+        print("5. Code-mixed handling (Hindi+English, etc.)")
+        mt_choice = input("👉 Enter 1-5 (default=1): ").strip() or "1"
+
+        mt_model_choice = "nllb"
+        mode = None
+        translit_scheme = None
+        code_mixed_english_action = "pass"
+
+        if mt_choice == "2":
+            mt_model_choice = "indic"
+        elif mt_choice == "3":
+            mt_model_choice = "google"
+            # Ensure googletrans is available; otherwise fall back to NLLB to avoid [translation_error]
+            if importlib.util.find_spec("googletrans") is None:
+                print("⚠️ googletrans not available. Install with: pip install googletrans==4.0.0-rc1")
+                print("   Falling back to Meta-NLLB for this run. (Or re-run and choose MT mode 1 or 2.)")
+                mt_model_choice = "nllb"
+        elif mt_choice == "4":
+            mode = "transliterate"
+        elif mt_choice == "5":
+            mode = "code_mixed"
+
+        # Target language menus
+        if mode == "transliterate":
+            print("\n🔤 Transliteration selected — choose Latin scheme:")
+            print("1. ITRANS (default)")
+            print("2. IAST")
+            print("3. HK (Harvard-Kyoto)")
+            ts_choice = input("👉 Enter 1-3 (default=1): ").strip()
+            if ts_choice == "2":
+                translit_scheme = "IAST"
+            elif ts_choice == "3":
+                translit_scheme = "HK"
+            else:
+                translit_scheme = "ITRANS"
+            # 🔄 Fix: tgt_lang irrelevant, set equal to src
+            tgt_lang = lang_code
         else:
-            tgt_lang = ISO_TO_FLORES["en"]
-
-        if mode == "code_mixed":
-            print("\n🧩 Code-mixed selected. Handle Latin runs how?")
-            print("1. Pass-through (default)")
-            print("2. Translate English runs")
-            cm_choice = input("👉 Enter 1 or 2 (default=1): ").strip()
-            if cm_choice == "2":
-                code_mixed_english_action = "translate"
-
-    # ===================
-    # Debug Options Menu
-    # ===================
-    if mode == "transliterate":
-        dbg_choice = "2"  # force batch only
-    else:
-        print("\n🛠️ Debug Options:")
-        print("1. Normal translation")
-        print("2. Batch translation (default)")
-        print("3. Back-translation debug")
-        print("4. NER-preservation mode (keep names)")
-        dbg_choice = input("👉 Enter 1-4 (default=2): ").strip() or "2"
+            print("\n🌍 Choose target translation language:")
+            print("=== Global Languages ===")
+            for key,(name,iso) in GLOBAL_LANGS.items():
+                flores = ISO_TO_FLORES.get(iso, iso)
+                print(f"{key}. {name} ({flores})")
+            print("\n=== Indian Languages ===")
+            for key,(name,iso) in INDIC_LANGS_MENU.items():
+                flores = ISO_TO_FLORES.get(iso, iso)
+                print(f"{key}. {name} ({flores})")
+            print("0. Custom FLORES code")
+
+            choice = input("👉 Enter choice (default=1 for English): ").strip()
+            if choice == "" or choice == "1":
+                tgt_lang = ISO_TO_FLORES["en"]
+            elif choice == "0":
+                tgt_lang = input("🔤 Enter custom FLORES code: ").strip()
+            elif choice in GLOBAL_LANGS:
+                iso = GLOBAL_LANGS[choice][1]
+                tgt_lang = ISO_TO_FLORES.get(iso, "eng_Latn")
+            elif choice in INDIC_LANGS_MENU:
+                iso = INDIC_LANGS_MENU[choice][1]
+                tgt_lang = ISO_TO_FLORES.get(iso, iso)
+            else:
+                tgt_lang = ISO_TO_FLORES["en"]
+
+            if mode == "code_mixed":
+                print("\n🧩 Code-mixed selected. Handle Latin runs how?")
+                print("1. Pass-through (default)")
+                print("2. Translate English runs")
+                cm_choice = input("👉 Enter 1 or 2 (default=1): ").strip()
+                if cm_choice == "2":
+                    code_mixed_english_action = "translate"
+
+        # ===================
+        # Debug Options Menu
+        # ===================
+        if mode == "transliterate":
+            dbg_choice = "2"  # force batch only
+        else:
+            print("\n🛠️ Debug Options:")
+            print("1. Normal translation")
+            print("2. Batch translation (default)")
+            print("3. Back-translation debug")
+            print("4. NER-preservation mode (keep names)")
+            dbg_choice = input("👉 Enter 1-4 (default=2): ").strip() or "2"
         
 # -------------------
 # Final Translation Logic (compose MT + Debug)
 # -------------------
 translated = ""
-if dbg_choice == "3":
+if dbg_choice == "stream":
+    translated = streamed_translation
+
+elif dbg_choice == "3":
     bt = mt_debug.back_translate(
         transcribed,
         lang_code,
@@ -507,6 +981,7 @@ if dbg_choice == "3":
         mode=mode,
         translit_scheme=translit_scheme,
         code_mixed_english_action=code_mixed_english_action,
+        num_beams=mt_beams,
     )
     print("➡️ Forward:", bt["forward"])
     print("⬅️ Backward:", bt["backward"])
@@ -521,6 +996,7 @@ elif dbg_choice == "4":
         mode="ner" if mode is None else mode,
         translit_scheme=translit_scheme,
         code_mixed_english_action=code_mixed_english_action,
+        num_beams=mt_beams,
     )
 
 elif dbg_choice == "1":
@@ -532,6 +1008,7 @@ elif dbg_choice == "1":
         mode=mode,
         translit_scheme=translit_scheme,
         code_mixed_english_action=code_mixed_english_action,
+        num_beams=mt_beams,
     )
 
 else:
@@ -543,6 +1020,7 @@ else:
         mode=mode,
         translit_scheme=translit_scheme,
         code_mixed_english_action=code_mixed_english_action,
+        num_beams=mt_beams,
     )
 
 # ✅ Save translation (for all MT/debug modes)
@@ -563,6 +1041,7 @@ if args.backtranslate:
         mode=mode,
         translit_scheme=translit_scheme,
         code_mixed_english_action=code_mixed_english_action,
+        num_beams=mt_beams,
     )
     print("\n🔁 Back-Translation Debug:")
     print("➡️ Forward:", bt["forward"])
@@ -583,33 +1062,8 @@ if args.tts:
 
             # Choose a voice description if user didn't provide one
             user_desc = args.tts_desc.strip() if args.tts_desc else ""
-            # Simple templates for common target languages (adjust as needed)
-            voice_templates = {
-                "hin": "Sunita speaks in a calm, neutral Hindi voice with clear audio and no background noise.",
-                "hin_Latn": "Sunita speaks in a calm, neutral Hindi voice with clear audio and no background noise.",
-                "eng_Latn": "A neutral English speaker speaks with a clear, moderately-paced British/Indian-accented voice.",
-                "tam": "Jaya speaks in a calm Tamil voice with natural prosody and clear audio.",
-                "tel": "Prakash speaks in a calm Telugu voice with natural prosody and clear audio.",
-                "kan": "Suresh speaks in a calm Kannada voice with clear audio and no background noise.",
-                # generic fallback
-                "default": "The speaker speaks naturally in clear audio with no background noise."
-            }
-
-            # pick template by target Flores code (tgt_lang may be an ISO/FLORES code)
-            # try simple match by prefix
-            desc = user_desc or voice_templates.get(tgt_lang, None)
-            if desc is None:
-                # try mapping languages by common substrings
-                if tgt_lang.startswith("hin") or tgt_lang.startswith("hi"):
-                    desc = voice_templates["hin"]
-                elif tgt_lang.startswith("eng") or tgt_lang.startswith("en"):
-                    desc = voice_templates["eng_Latn"]
-                elif tgt_lang.startswith("tam") or tgt_lang.startswith("ta"):
-                    desc = voice_templates["tam"]
-                elif tgt_lang.startswith("tel") or tgt_lang.startswith("te"):
-                    desc = voice_templates["tel"]
-                else:
-                    desc = voice_templates["default"]
+            profile = LANG_PROFILE.get(tgt_lang)
+            desc = user_desc or (profile.tts_desc if profile else _DEFAULT_TTS_DESC)
 
             # output filename
             if args.tts_save:
@@ -664,8 +1118,8 @@ if args.tts:
 
 
 # Summary
-dialect = detect_dialect(audio_path)
-spoofed = is_spoofed_audio(audio_path)
+dialect = detect_dialect(audio_pcm)
+spoofed = is_spoofed_audio(audio_pcm)
 print("\n📄 Summary:")
 print(f"🗣 Detected Language: {lang_code}")
 print(f"🧬 Dialect: {dialect}")
@@ -1,20 +1,82 @@
 import os
 import sys
+
+# Keep the caching allocator warm across requests; expandable segments limit
+# fragmentation instead of calling empty_cache() after every stage.
+# Must be set before torch is imported: the allocator reads it once.
+os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+
 import torch
 import warnings
 import logging
-import tempfile
 import base64
 import json
-from flask import Flask, request, jsonify, send_file, redirect
+import contextlib
+import functools
+from flask import Flask, request, jsonify, send_file, send_from_directory, redirect, url_for
 from flask_cors import CORS
 from flasgger import Swagger
 from transformers import logging as hf_logging
 import threading
-import gc
+import queue
+import time
+import itertools
+import numpy as np
+from concurrent.futures import Future
+
+try:
+    import pybase64 as b64  # SIMD base64 (pip install pybase64)
+except Exception:
+    b64 = base64
 
-# Global GPU Lock to prevent CUDA collisions in threaded Flask
-GPU_LOCK = threading.Lock()
+try:
+    import webrtcvad  # pip install webrtcvad
+except Exception:
+    webrtcvad = None
+
+# Per-stage locks: a request in MT or TTS no longer blocks another request's ASR,
+# and network-bound stages (Google MT, gTTS) run without holding any lock
+ASR_LOCK = threading.Lock()
+XTTS_LOCK = threading.Lock()
+
+# Bounded request concurrency: werkzeug's threaded server spawns a thread per connection,
+# so at most VASHA_WORKERS requests run the pipeline at once, each on its own CUDA stream
+VASHA_WORKERS = max(1, int(os.getenv("VASHA_WORKERS", "4")))
+_WORKER_SLOTS = queue.Queue()
+
+def _init_worker_slots():
+    for _ in range(VASHA_WORKERS):
+        _WORKER_SLOTS.put(torch.cuda.Stream() if torch.cuda.is_available() else None)
+
+@contextlib.contextmanager
+def worker_slot():
+    """Hold one of the VASHA_WORKERS slots; torch work inside runs on that slot's stream."""
+    stream = _WORKER_SLOTS.get()
+    try:
+        if stream is None:
+            yield
+        else:
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                yield
+            # results must be ready before the response is built
+            stream.synchronize()
+    finally:
+        _WORKER_SLOTS.put(stream)
+
+def release_cuda_cache():
+    """Hand cached CUDA blocks back to the driver; only off the hot path (errors, disconnects)."""
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+def in_worker_slot(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with worker_slot():
+            return fn(*args, **kwargs)
+    return wrapper
+
+_init_worker_slots()
 
 # Silence logs
 os.environ["HF_HUB_DISABLE_PROGRESS_BARS"] = "1"
@@ -26,10 +88,13 @@ warnings.filterwarnings("ignore")
 sys.path.append(os.getcwd())
 
 # Import Vasha Modules
-from LID_Model.lid import LanguageIdentifier
+from LID_Model.lid import LanguageIdentifier, get_whisper as get_cached_whisper, load_audio_array
 from ASR_Model.indic_conformer.conformer_asr import IndicConformerASR
-from MT_Model.mt_helper import perform_translation, ISO_TO_FLORES
+from MT_Model.mt_helper import perform_translation
+from MT_Model.lang_maps import ISO_TO_FLORES, CONFORMER_LANGS
+from MT_Model import mt_model
 from TTS_Model.tts_common.tts_handler import run_universal_tts
+from TTS_Model.tts_common.tts_interface import XTTS_COMPILE
 import whisper
 
 app = Flask(__name__)
@@ -75,66 +140,255 @@ template = {
 
 swagger = Swagger(app, config=swagger_config, template=template)
 
-# --- Global Models (Lazy Loading) ---
+# --- Global Models (loaded by warmup() at startup, lazily otherwise) ---
+# One lock for all getters: concurrent first requests under threaded=True must not double-load
+_MODEL_LOAD_LOCK = threading.Lock()
 WHISPER_MODEL = None
 FASTER_WHISPER_MODEL = None
 INDIC_CONFORMER_MODEL = None
 LID_MODEL = None
 
 # ASR Constants
-CONFORMER_LANGS = {
-    'as','bn','brx','doi','gu','hi','kn','kok','ks','mai','ml','mni','mr','ne',
-    'or','pa','sa','sat','sd','ta','te','ur'
-}
-WHISPER_LANGS = set(['en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'zh', 'ja', 'ko', 'ar', 'tr', 'id'])
+WHISPER_LANGS = frozenset(['en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'zh', 'ja', 'ko', 'ar', 'tr', 'id'])
+_unmapped = (CONFORMER_LANGS | WHISPER_LANGS) - ISO_TO_FLORES.keys()
+assert not _unmapped, f"ISO_TO_FLORES is missing ASR languages: {sorted(_unmapped)}"
+
+# Decoded chunks whose RMS is below this are treated as silence and skip the whole pipeline
+SILENCE_RMS = float(os.getenv("VASHA_SILENCE_RMS", "1e-3"))
+
+# Anything shorter than 50 ms cannot hold a word
+MIN_AUDIO_SAMPLES = 16000 // 20
+
+def is_silent(audio):
+    if audio.size < MIN_AUDIO_SAMPLES:
+        return True
+    return float(np.sqrt(np.dot(audio, audio) / audio.size)) < SILENCE_RMS
+
+# /stream_audio re-runs LID at most this often per session (or after two empty ASR results)
+LID_REFRESH_S = float(os.getenv("VASHA_LID_REFRESH_S", "10"))
+
+# Streaming chunks with fewer voiced 30 ms frames than this (webrtcvad, aggressiveness 2) skip LID/ASR
+VAD_MIN_VOICED = float(os.getenv("VASHA_VAD_MIN_VOICED", "0.1"))
+_VAD_FRAME = 480  # 30 ms at 16 kHz
+_vad_local = threading.local()
+
+def voiced_ratio(audio):
+    """Fraction of 30 ms frames webrtcvad calls speech; 1.0 when webrtcvad is not installed."""
+    if webrtcvad is None:
+        return 1.0
+    vad = getattr(_vad_local, "vad", None)
+    if vad is None:
+        vad = _vad_local.vad = webrtcvad.Vad(2)
+    n = audio.size // _VAD_FRAME
+    if n == 0:
+        return 0.0
+    pcm = (np.clip(audio[:n * _VAD_FRAME], -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+    step = _VAD_FRAME * 2
+    voiced = sum(vad.is_speech(pcm[i:i + step], 16000) for i in range(0, len(pcm), step))
+    return voiced / n
+
+# TTS output is served from here via /tts/<name>; clips up to this size are also inlined as base64.
+# tmpfs (/dev/shm) keeps the per-request wav off the block device; VASHA_TTS_DIR overrides.
+TTS_OUT_DIR = os.getenv("VASHA_TTS_DIR") or (
+    "/dev/shm/vasha_tts" if os.path.isdir("/dev/shm") else os.path.join(os.getcwd(), "sessions", "server_temp")
+)
+TTS_INLINE_MAX_BYTES = int(os.getenv("VASHA_TTS_INLINE_MAX_BYTES", str(32 * 1024)))
+# The janitor thread deletes an output VASHA_TTS_SERVED_GRACE seconds after it was first
+# served (replays and range requests still hit), or VASHA_TTS_TTL seconds after it was
+# written if it is never fetched (slow or queued clients, the extension's playback queue)
+TTS_OUT_TTL = float(os.getenv("VASHA_TTS_TTL", "1800"))
+TTS_SERVED_GRACE = float(os.getenv("VASHA_TTS_SERVED_GRACE", "300"))
+_TTS_SERVED = {}  # name -> first time served
+
+def _tts_janitor():
+    while True:
+        time.sleep(max(1.0, min(TTS_OUT_TTL, TTS_SERVED_GRACE) / 2))
+        now = time.time()
+        try:
+            with os.scandir(TTS_OUT_DIR) as it:
+                for entry in it:
+                    try:
+                        if not entry.is_file():
+                            continue
+                        served = _TTS_SERVED.get(entry.name)
+                        if (served is not None and served < now - TTS_SERVED_GRACE) or \
+                                entry.stat().st_mtime < now - TTS_OUT_TTL:
+                            os.unlink(entry.path)
+                            _TTS_SERVED.pop(entry.name, None)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+
+# itertools.count.__next__ is atomic under the GIL, so concurrent requests get distinct names
+_TTS_NAME_CTR = itertools.count()
+
+os.makedirs(TTS_OUT_DIR, exist_ok=True)
+threading.Thread(target=_tts_janitor, name="tts-janitor", daemon=True).start()
 
-print("Vasha-AI Server Starting... Models will load on first request.")
+print("Vasha-AI Server Starting...")
 
 def get_whisper():
     global WHISPER_MODEL
     if WHISPER_MODEL is None:
-        print("Loading Whisper Model (small)...")
-        WHISPER_MODEL = whisper.load_model("small")
+        with _MODEL_LOAD_LOCK:
+            if WHISPER_MODEL is None:
+                print("Loading Whisper Model (small)...")
+                # shared cache with LID (VASHA_LID_BACKEND=whisper): on CPU-only hosts this is the very same instance
+                WHISPER_MODEL = get_cached_whisper("small")
     return WHISPER_MODEL
 
 def get_faster_whisper():
     global FASTER_WHISPER_MODEL
     if FASTER_WHISPER_MODEL is None:
-        try:
-            from faster_whisper import WhisperModel
-            model_size = "large-v3"
-            print(f"Loading Faster-Whisper Model ({model_size})...")
-            print("First run may download model and take several minutes.")
+        with _MODEL_LOAD_LOCK:
+            if FASTER_WHISPER_MODEL is None:
+                _load_faster_whisper()
+    return FASTER_WHISPER_MODEL
 
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-            if device == "cuda":
-                torch.cuda.empty_cache()
+FW_MODEL_NAME = os.getenv("VASHA_ASR_MODEL", "large-v3")
 
-            FASTER_WHISPER_MODEL = WhisperModel(model_size, device=device, compute_type="float16")
-            print("Faster-Whisper Loaded.")
-        except Exception as e:
-            print(f"Faster-Whisper load failed: {e}")
-            return None
-    return FASTER_WHISPER_MODEL
+def _load_faster_whisper():
+    global FASTER_WHISPER_MODEL
+    try:
+        from faster_whisper import WhisperModel
+        # VASHA_ASR_MODEL: any faster-whisper size or CT2 repo id, e.g. "small" (multilingual, ~5x
+        # smaller) or "distil-large-v3" (English-only: only for servers that never see other languages)
+        model_size = FW_MODEL_NAME
+        # Pre-converted CTranslate2 weights load without re-quantizing at boot:
+        #   ct2-transformers-converter --model openai/whisper-large-v3 --output_dir ct2/whisper-large-v3 \
+        #       --quantization int8_float16 --copy_files tokenizer.json preprocessor_config.json
+        local_dir = os.getenv("VASHA_WHISPER_LOCAL") or os.path.join(
+            os.getenv("VASHA_CT2_DIR", "ct2"), "whisper-" + os.path.basename(model_size)
+        )
+        if os.path.isdir(local_dir):
+            model_size = local_dir
+        print(f"Loading Faster-Whisper Model ({model_size})...")
+        print("First run may download model and take several minutes.")
+
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        if device == "cuda":
+            torch.cuda.empty_cache()
+
+        # VASHA_FW_COMPUTE overrides; int8 weights with fp16 activations on GPU, float16 is not supported by CTranslate2 on CPU
+        compute_type = os.getenv("VASHA_FW_COMPUTE") or ("int8_float16" if device == "cuda" else "int8")
+        kwargs = {"cpu_threads": max(1, (os.cpu_count() or 2) // 2)} if device == "cpu" else {}
+        FASTER_WHISPER_MODEL = WhisperModel(model_size, device=device, compute_type=compute_type, **kwargs)
+        print("Faster-Whisper Loaded.")
+    except Exception as e:
+        print(f"Faster-Whisper load failed: {e}")
+
+# Silero VAD drops silent stretches before decoding; chunks are short, so no cross-window conditioning
+FW_VAD_PARAMS = {"min_silence_duration_ms": 300}
+
+def fw_transcribe(fw, audio, language, beam_size=1, **kwargs):
+    """faster-whisper transcribe with the server's VAD/decoding defaults; segments are materialized."""
+    segments, info = fw.transcribe(
+        audio,
+        language=language,
+        beam_size=beam_size,
+        vad_filter=True,
+        vad_parameters=FW_VAD_PARAMS,
+        condition_on_previous_text=False,
+        **kwargs
+    )
+    return list(segments), info
 
 def get_indic_conformer():
     global INDIC_CONFORMER_MODEL
     if INDIC_CONFORMER_MODEL is None:
-        try:
-            print("Loading IndicConformer...")
-            INDIC_CONFORMER_MODEL = IndicConformerASR()
-        except Exception as e:
-            print(f"IndicConformer load failed: {e}")
-            return None
+        with _MODEL_LOAD_LOCK:
+            if INDIC_CONFORMER_MODEL is None:
+                try:
+                    print("Loading IndicConformer...")
+                    INDIC_CONFORMER_MODEL = IndicConformerASR()
+                except Exception as e:
+                    print(f"IndicConformer load failed: {e}")
+                    return None
     return INDIC_CONFORMER_MODEL
 
 def get_lid():
     global LID_MODEL
     if LID_MODEL is None:
-        print("Loading LID Model (Whisper-Small) on CPU to save VRAM...")
-        LID_MODEL = LanguageIdentifier(device="cpu")
+        with _MODEL_LOAD_LOCK:
+            if LID_MODEL is None:
+                # ECAPA (~20 MB) when speechbrain is installed, else faster-whisper small; on CPU to save VRAM
+                print("Loading LID Model on CPU to save VRAM...")
+                LID_MODEL = LanguageIdentifier(device="cpu", backend=os.getenv("VASHA_LID_BACKEND", "ecapa"))
     return LID_MODEL
 
+class DynamicBatcher:
+    """
+    Coalesce concurrent submit() calls into one batched call on a worker thread:
+    block for the first item, then drain until max_batch items or max_wait_ms pass.
+    fn(list_of_items) -> list_of_results, in order; an Exception in the results fails only that item.
+    """
+
+    def __init__(self, fn, max_batch=16, max_wait_ms=10, name="batcher"):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.q = queue.Queue()
+        threading.Thread(target=self._run, name=name, daemon=True).start()
+
+    def submit(self, item):
+        fut = Future()
+        self.q.put((item, fut))
+        return fut.result()
+
+    def _drain(self):
+        batch = [self.q.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.q.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._drain()
+            try:
+                results = self.fn([item for item, _ in batch])
+                for (_, fut), res in zip(batch, results):
+                    if isinstance(res, Exception):
+                        fut.set_exception(res)
+                    else:
+                        fut.set_result(res)
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+
+def _nllb_batch(items):
+    """
+    items: (text, src_iso, tgt_flores); one batched NLLB pass per language pair.
+    A failing pair (e.g. unmapped source ISO) fails only its own items.
+    """
+    results = [None] * len(items)
+    groups = {}
+    for i, (_, src, tgt) in enumerate(items):
+        groups.setdefault((src, tgt), []).append(i)
+    for (src, tgt), idxs in groups.items():
+        try:
+            outs = mt_model.translate_many([items[i][0] for i in idxs], src, tgt, mt_model_choice="nllb")
+        except Exception as e:
+            outs = [e] * len(idxs)
+        for i, out in zip(idxs, outs):
+            results[i] = out
+    return results
+
+# NLLB fallback MT: concurrent requests share generate() batches
+NLLB_BATCHER = DynamicBatcher(
+    _nllb_batch,
+    max_batch=int(os.getenv("VASHA_MT_MAX_BATCH", "16")),
+    max_wait_ms=float(os.getenv("VASHA_MT_BATCH_WAIT_MS", "10")),
+    name="nllb-batcher",
+)
+
 # Try to import flask_sock for WebSockets
 try:
     from flask_sock import Sock
@@ -166,49 +420,52 @@ def health():
         "websocket_enabled": HAS_WEBSOCKET
     })
 
-def run_asr_chunk(input_path, detected_lang, model_choice, word_timestamps):
+def run_asr_chunk(audio, detected_lang, model_choice, word_timestamps, beam_size=1, partial=False):
     text = ""
     asr_used = "unknown"
     words = None
 
-    with GPU_LOCK:
-        if model_choice == "indic_conformer":
-            conformer = get_indic_conformer()
-            if conformer:
-                text = conformer.transcribe(input_path, detected_lang, decoder_type="ctc")
-                asr_used = "indic_conformer"
-
-        if not text and model_choice == "faster_whisper":
-            fw = get_faster_whisper()
-            if fw:
-                segments, _ = fw.transcribe(
-                    input_path,
-                    language=detected_lang,
-                    beam_size=5,
-                    word_timestamps=word_timestamps
+    # ASR_LOCK covers only the model calls; joining text and building word dicts happen after release
+    if model_choice == "indic_conformer":
+        conformer = get_indic_conformer()
+        if conformer:
+            with ASR_LOCK:
+                text = conformer.transcribe(audio, detected_lang, decoder_type="ctc")
+            asr_used = "indic_conformer"
+
+    if not text and model_choice == "faster_whisper":
+        fw = get_faster_whisper()
+        if fw:
+            with ASR_LOCK:
+                segments, _ = fw_transcribe(
+                    fw,
+                    audio,
+                    detected_lang,
+                    beam_size=beam_size,
+                    word_timestamps=word_timestamps,
+                    # partials are re-decoded on the final chunk: one greedy pass, no temperature fallback
+                    **({"temperature": 0.0, "best_of": 1} if partial else {})
                 )
-                text = " ".join([s.text for s in segments]).strip()
-                asr_used = "faster_whisper"
-                if word_timestamps:
-                    words = []
-                    for s in segments:
-                        if not s.words:
-                            continue
-                        for w in s.words:
-                            words.append({
-                                "word": w.word.strip(),
-                                "start_time": w.start,
-                                "end_time": w.end
-                            })
-
-        if not text:
-            model = get_whisper()
-            result = model.transcribe(input_path, language=detected_lang)
-            text = result['text'].strip()
-            asr_used = "whisper_standard"
-
-        gc.collect()
-        torch.cuda.empty_cache()
+            text = " ".join([s.text for s in segments]).strip()
+            asr_used = "faster_whisper"
+            if word_timestamps:
+                words = []
+                for s in segments:
+                    if not s.words:
+                        continue
+                    for w in s.words:
+                        words.append({
+                            "word": w.word.strip(),
+                            "start_time": w.start,
+                            "end_time": w.end
+                        })
+
+    if not text:
+        model = get_whisper()
+        with ASR_LOCK:
+            result = model.transcribe(audio, language=detected_lang, fp16=model.device.type == "cuda")
+        text = result['text'].strip()
+        asr_used = "whisper_standard"
 
     return text, asr_used, words
 
@@ -230,7 +487,10 @@ if HAS_WEBSOCKET:
             "target_lang": "en",
             "asr_model": "faster_whisper",
             "partial_enabled": True,
-            "word_timestamps": False
+            "word_timestamps": False,
+            # (language, confidence, monotonic time) of the last LID run, and empty ASR results since
+            "lid_cache": (None, 0.0, 0.0),
+            "empty_asr": 0
         }
 
         try:
@@ -239,13 +499,16 @@ if HAS_WEBSOCKET:
                 if data is None:
                     break
 
-                if isinstance(data, bytes):
-                    continue
-
-                try:
-                    msg = json.loads(data)
-                except Exception:
-                    continue
+                # Binary frame = the audio for the preceding audio_chunk header (no base64)
+                if isinstance(data, (bytes, bytearray)):
+                    msg = state.pop("pending_header", None) or {"type": "audio_chunk"}
+                    audio_bytes = bytes(data)
+                else:
+                    try:
+                        msg = json.loads(data)
+                    except Exception:
+                        continue
+                    audio_bytes = None
 
                 if msg.get("type") == "control":
                     state["target_lang"] = msg.get("target_lang", state["target_lang"])
@@ -257,9 +520,16 @@ if HAS_WEBSOCKET:
                 if msg.get("type") != "audio_chunk":
                     continue
 
-                audio_b64 = msg.get("audio_b64")
-                if not audio_b64:
-                    continue
+                if audio_bytes is None:
+                    audio_b64 = msg.get("audio_b64")
+                    if not audio_b64:
+                        # header only; the audio follows as a binary frame
+                        state["pending_header"] = msg
+                        continue
+                    try:
+                        audio_bytes = b64.b64decode(audio_b64)
+                    except Exception:
+                        continue
 
                 is_final = bool(msg.get("is_final", False))
                 partial_enabled = bool(msg.get("partial_enabled", state["partial_enabled"]))
@@ -271,24 +541,32 @@ if HAS_WEBSOCKET:
                 if (not is_final) and (not partial_enabled):
                     continue
 
-                try:
-                    audio_bytes = base64.b64decode(audio_b64)
-                except Exception:
+                if len(audio_bytes) < 1024:
                     continue
 
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_in:
-                    temp_in.write(audio_bytes)
-                    input_path = temp_in.name
-
-                if os.path.getsize(input_path) < 1024:
+                # decode once; LID and ASR all take the 16 kHz array
+                try:
+                    audio = load_audio_array(audio_bytes)
+                except Exception as e:
+                    print(f"Audio decode failed: {e}")
+                    continue
+                if is_silent(audio) or voiced_ratio(audio) < VAD_MIN_VOICED:
                     continue
 
-                # LID
-                lid = get_lid()
-                detected_lang, confidence_dict = lid.detect(input_path, duration_limit=2.0)
-                confidence = confidence_dict.get(detected_lang, 0.0)
-                if not detected_lang:
-                    detected_lang = "en"
+                # LID: the speaker's language rarely changes mid-session, so reuse the last
+                # result until it is LID_REFRESH_S old or ASR came back empty twice in a row
+                cached_lang, cached_conf, lid_time = state["lid_cache"]
+                if cached_lang is None or state["empty_asr"] >= 2 or time.monotonic() - lid_time > LID_REFRESH_S:
+                    lid = get_lid()
+                    with worker_slot():
+                        detected_lang, confidence_dict = lid.detect(audio, duration_limit=2.0)
+                    confidence = confidence_dict.get(detected_lang, 0.0)
+                    if not detected_lang:
+                        detected_lang = "en"
+                    state["lid_cache"] = (detected_lang, confidence, time.monotonic())
+                    state["empty_asr"] = 0
+                else:
+                    detected_lang, confidence = cached_lang, cached_conf
 
                 # Determine ASR model (backend override)
                 preferred_model_raw = msg.get("asr_model", state["asr_model"])
@@ -309,15 +587,20 @@ if HAS_WEBSOCKET:
                     }))
 
                 # ASR
-                text, asr_used, words = run_asr_chunk(
-                    input_path,
-                    detected_lang,
-                    effective_model,
-                    word_ts
-                )
+                with worker_slot():
+                    text, asr_used, words = run_asr_chunk(
+                        audio,
+                        detected_lang,
+                        effective_model,
+                        word_ts,
+                        beam_size=5 if is_final else 1,
+                        partial=not is_final
+                    )
 
                 if not text:
+                    state["empty_asr"] += 1
                     continue
+                state["empty_asr"] = 0
 
                 response = {
                     "type": "asr_final" if is_final else "asr_partial",
@@ -339,8 +622,10 @@ if HAS_WEBSOCKET:
                 pass
         finally:
             print("WebSocket Disconnected")
+            release_cuda_cache()
 
 @app.route('/transcribe_translate', methods=['POST'])
+@in_worker_slot
 def process_audio():
     """
     Process Audio Chunk
@@ -349,6 +634,11 @@ def process_audio():
       - Pipeline
     consumes:
       - multipart/form-data
+      - audio/wav
+    description: >
+      Send the audio either as the multipart field "audio", or as the raw
+      request body with Content-Type audio/* and target_lang / mode in the
+      query string.
     parameters:
       - name: audio
         in: formData
@@ -361,34 +651,42 @@ def process_audio():
         required: false
         default: en
         description: Target language ISO code (e.g. hi, es, fr)
+      - name: mode
+        in: formData
+        type: string
+        required: false
+        default: fast
+        description: "fast" (greedy ASR decoding) or "quality" (beam search)
     responses:
       200:
         description: Processed result
     """
     try:
-        if 'audio' not in request.files:
-            return jsonify({"error": "No audio file provided"}), 400
-
-        audio_file = request.files['audio']
-        target_lang_iso = request.form.get('target_lang', 'en')
-        mode = request.form.get('mode', 'fast')
+        # Raw body (Content-Type: audio/*, options in the query string) skips the multipart parser
+        if (request.mimetype or "").startswith("audio/") or request.mimetype == "application/octet-stream":
+            raw = request.get_data(cache=False)
+            params = request.args
+        else:
+            if 'audio' not in request.files:
+                return jsonify({"error": "No audio file provided"}), 400
+            raw = request.files['audio'].read()
+            params = request.form
+        target_lang_iso = params.get('target_lang', 'en')
+        mode = params.get('mode', 'fast')
 
         target_flores = ISO_TO_FLORES.get(target_lang_iso, "eng_Latn")
-        if target_lang_iso == "hi": target_flores = "hin_Deva"
-        if target_lang_iso == "ja": target_flores = "jpn_Jpan"
-        if target_lang_iso == "es": target_flores = "spa_Latn"
-        if target_lang_iso == "fr": target_flores = "fra_Latn"
 
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_in:
-            audio_file.save(temp_in.name)
-            input_path = temp_in.name
+        if len(raw) < 1024:
+            return jsonify({"status": "empty", "message": "Audio too short/silent"}), 200
 
-        if os.path.getsize(input_path) < 1024:
+        # Decode once in memory; LID, ASR and the Whisper fallback all take the 16 kHz array
+        audio = load_audio_array(raw)
+        if is_silent(audio):
             return jsonify({"status": "empty", "message": "Audio too short/silent"}), 200
 
         # 1. Language Identification
         lid = get_lid()
-        detected_lang, confidence_dict = lid.detect(input_path, duration_limit=2.0)
+        detected_lang, confidence_dict = lid.detect(audio, duration_limit=2.0)
         confidence = confidence_dict.get(detected_lang, 0.0)
 
         if not detected_lang:
@@ -402,12 +700,13 @@ def process_audio():
         asr_used = "unknown"
 
         INDIC_SET = {'hi', 'bn', 'as', 'or', 'ta', 'te'}
+        beam_size = 5 if mode == "quality" else 1
 
-        with GPU_LOCK:
+        with ASR_LOCK:
             if detected_lang in INDIC_SET:
                 conformer = get_indic_conformer()
                 if conformer:
-                    text = conformer.transcribe(input_path, detected_lang, decoder_type="ctc")
+                    text = conformer.transcribe(audio, detected_lang, decoder_type="ctc")
                     asr_used = "indic_conformer"
                 else:
                     print("IndicConformer unavailable, falling back to Whisper")
@@ -415,38 +714,33 @@ def process_audio():
             elif detected_lang == 'en':
                 fw = get_faster_whisper()
                 if fw:
-                    segments, _ = fw.transcribe(input_path, language=detected_lang, beam_size=5)
+                    segments, _ = fw_transcribe(fw, audio, detected_lang, beam_size=beam_size)
                     text = " ".join([s.text for s in segments]).strip()
                     asr_used = "faster_whisper_large"
                 else:
                     model = get_whisper()
-                    result = model.transcribe(input_path, language=detected_lang)
+                    result = model.transcribe(audio, language=detected_lang, fp16=model.device.type == "cuda")
                     text = result['text'].strip()
                     asr_used = "whisper_standard"
             else:
                 fw = get_faster_whisper()
                 if fw:
-                    segments, _ = fw.transcribe(input_path, language=detected_lang, beam_size=5)
+                    segments, _ = fw_transcribe(fw, audio, detected_lang, beam_size=beam_size)
                     text = " ".join([s.text for s in segments]).strip()
                     asr_used = "faster_whisper_large"
                 else:
                     model = get_whisper()
-                    result = model.transcribe(input_path, language=detected_lang)
+                    result = model.transcribe(audio, language=detected_lang, fp16=model.device.type == "cuda")
                     text = result['text'].strip()
                     asr_used = "whisper_standard"
 
-            gc.collect()
-            torch.cuda.empty_cache()
-
         if not text:
             if asr_used == "unknown" or asr_used == "indic_conformer":
-                with GPU_LOCK:
+                with ASR_LOCK:
                     model = get_whisper()
-                    result = model.transcribe(input_path, language=detected_lang)
+                    result = model.transcribe(audio, language=detected_lang, fp16=model.device.type == "cuda")
                     text = result['text'].strip()
                     asr_used = "whisper_fallback"
-                    gc.collect()
-                    torch.cuda.empty_cache()
 
         if not text:
             return jsonify({"status": "empty", "message": "No speech detected"})
@@ -458,7 +752,10 @@ def process_audio():
 
         translated_text = ""
         mt_backend = "google"
-        with GPU_LOCK:
+        if ISO_TO_FLORES.get(detected_lang, detected_lang) == target_flores:
+            translated_text = text
+            mt_backend = "passthrough"
+        else:
             try:
                 translated_text = perform_translation(
                     text,
@@ -473,39 +770,31 @@ def process_audio():
                     raise RuntimeError("GoogleMT produced empty or unchanged output")
             except Exception as mt_err:
                 print(f"GoogleMT failed, falling back to NLLB: {mt_err}")
-                translated_text = perform_translation(
-                    text,
-                    detected_lang,
-                    target_flores,
-                    backend_choice="nllb"
-                )
+                translated_text = NLLB_BATCHER.submit((text, detected_lang, target_flores))
                 mt_backend = "nllb"
-            gc.collect()
-            torch.cuda.empty_cache()
 
         print(f"Translated ({target_flores}): {translated_text}")
 
         # 4. TTS
-        output_tts_filename = f"out_{os.path.basename(input_path)}"
-        out_dir = os.path.join(os.getcwd(), "sessions", "server_temp")
-        os.makedirs(out_dir, exist_ok=True)
+        output_tts_filename = f"out_{os.getpid()}_{next(_TTS_NAME_CTR):012d}.wav"
+        out_dir = TTS_OUT_DIR
 
         tts_path = ""
         tts_backend = "gtts"
 
-        with GPU_LOCK:
-            try:
-                tts_path = run_universal_tts(
-                    text=translated_text,
-                    target_lang=target_flores,
-                    prefer="gtts",
-                    out_dir=out_dir,
-                    out_name=output_tts_filename,
-                    reference_audio=None
-                )
-            except Exception as e:
-                print(f"gTTS failed, falling back to XTTS: {e}")
-                tts_backend = "xtts"
+        try:
+            tts_path = run_universal_tts(
+                text=translated_text,
+                target_lang=target_flores,
+                prefer="gtts",
+                out_dir=out_dir,
+                out_name=output_tts_filename,
+                reference_audio=None
+            )
+        except Exception as e:
+            print(f"gTTS failed, falling back to XTTS: {e}")
+            tts_backend = "xtts"
+            with XTTS_LOCK:
                 try:
                     tts_path = run_universal_tts(
                         text=translated_text,
@@ -517,13 +806,16 @@ def process_audio():
                     )
                 except Exception as e2:
                     print(f"TTS Failed (XTTS fallback): {e2}")
-            gc.collect()
-            torch.cuda.empty_cache()
 
+        # Serve the wav by URL (sendfile, no +33% base64 inflation); only tiny clips are inlined
         audio_b64 = ""
+        audio_url = ""
         if tts_path and os.path.exists(tts_path):
-            with open(tts_path, "rb") as f:
-                audio_b64 = base64.b64encode(f.read()).decode('utf-8')
+            name = os.path.basename(tts_path)
+            audio_url = url_for("serve_tts", name=name, _external=True)
+            if os.path.getsize(tts_path) <= TTS_INLINE_MAX_BYTES:
+                with open(tts_path, "rb") as f:
+                    audio_b64 = b64.b64encode(f.read()).decode('ascii')
 
         return jsonify({
             "status": "success",
@@ -538,30 +830,114 @@ def process_audio():
             "transcribed_text": text,
             "translated_text": translated_text,
             "audio_base64": audio_b64,
+            "audio_url": audio_url,
             "target_lang": target_flores
         })
 
     except Exception as e:
         print(f"Server Error: {e}")
+        release_cuda_cache()
         return jsonify({"error": str(e)}), 500
 
-if __name__ == "__main__":
-    print("\n" + "="*50)
-    print("INITIALIZING VASHA-AI SERVER")
-    print("="*50)
+@app.route('/tts/<path:name>', methods=['GET'])
+def serve_tts(name):
+    """
+    Synthesized Audio
+    ---
+    tags:
+      - Pipeline
+    parameters:
+      - name: name
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: audio/wav
+    """
+    resp = send_from_directory(TTS_OUT_DIR, name, mimetype="audio/wav", conditional=True)
+    _TTS_SERVED.setdefault(name, time.time())
+    return resp
+
+def warmup():
+    """
+    Load every model the request path uses (LID, Faster-Whisper, IndicConformer,
+    Whisper fallback, NLLB) and run one tiny forward pass through each, so the
+    first request doesn't pay for loading, CUDA context and kernel selection.
+    """
     print("Pre-loading critical models to prevent runtime lags...")
+    silence = np.zeros(16000, dtype=np.float32)
 
     # 1. Load LID (Fast)
-    get_lid()
+    get_lid()._prime()
 
     # 2. Load Faster-Whisper (Heavy)
     fw = get_faster_whisper()
     if fw:
-        print("Whisper Large-v3 Ready")
+        segments, _ = fw.transcribe(silence, language="en", beam_size=1)
+        list(segments)
+        print(f"Faster-Whisper ({FW_MODEL_NAME}) Ready")
     else:
-        print("Whisper Large-v3 Failed to Load (Will retry on request)")
+        print(f"Faster-Whisper ({FW_MODEL_NAME}) Failed to Load (Will retry on request)")
+
+    # 3. IndicConformer
+    conformer = get_indic_conformer()
+    if conformer:
+        try:
+            conformer.transcribe(silence, "hi", decoder_type="ctc")
+            print("IndicConformer Ready")
+        except Exception as e:
+            print(f"IndicConformer warmup failed: {e}")
+
+    # 4. Whisper (fallback path)
+    try:
+        model = get_whisper()
+        model.transcribe(silence, language="en", fp16=model.device.type == "cuda")
+        print("Whisper Small Ready")
+    except Exception as e:
+        print(f"Whisper warmup failed: {e}")
+
+    # 5. NLLB
+    try:
+        mt_model.warmup()
+        if mt_model.MT_COMPILE or mt_model.MT_CUDAGRAPH:
+            # cudagraph trees are thread-local: capture on the thread that serves NLLB traffic
+            for n in (16, 32, 64, 128):
+                NLLB_BATCHER.submit((" ".join(["warmup"] * (n - 2)), "en", "hin_Deva"))
+        print("NLLB Ready")
+    except Exception as e:
+        print(f"NLLB warmup failed (will load on request): {e}")
+
+    # 6. XTTS, only when compiled (VASHA_XTTS_COMPILE=1): pay the compile here, not on the first fallback
+    if XTTS_COMPILE:
+        try:
+            run_universal_tts(
+                text="Hello, this is a warmup.",
+                target_lang="eng_Latn",
+                prefer="xtts",
+                out_dir=TTS_OUT_DIR,
+                out_name="warmup_xtts.wav",
+                reference_audio=None
+            )
+            print("XTTS Ready")
+        except Exception as e:
+            print(f"XTTS warmup failed: {e}")
+
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+        torch.cuda.empty_cache()
+
+if __name__ == "__main__":
+    print("\n" + "="*50)
+    print("INITIALIZING VASHA-AI SERVER")
+    print("="*50)
+
+    if os.getenv("VASHA_WARMUP", "1") == "1":
+        warmup()
 
     print("\nSERVER READY - LISTENING FOR REQUESTS")
     print("="*50 + "\n")
 
-    app.run(host="0.0.0.0", port=5000, debug=True, use_reloader=False, threaded=True)
+    # Werkzeug's debugger is opt-in (FLASK_DEBUG=1): it exposes a remote console and slows every request
+    debug = os.getenv("FLASK_DEBUG", "0") == "1"
+    app.run(host="0.0.0.0", port=5000, debug=debug, use_reloader=False, threaded=True)